@@ -1,13 +1,28 @@
 // LayKit CLI Tool
 // Command-line interface for GDSII and OASIS file operations
 
-use laykit::format_detection::{FileFormat, detect_format_from_file};
+use laykit::format_detection::{FileFormat, detect_format_from_bytes, detect_format_from_file};
 use laykit::{GDSIIFile, LayoutFile, OASISFile, converter, load};
 use std::env;
 use std::fs;
+use std::io::{self, BufRead, Read, Write};
 use std::path::Path;
 use std::process;
 
+/// Output path that makes `convert` write the layout to stdout.
+const STDOUT_PATH: &str = "-";
+
+/// Input path that makes `convert` read the layout from stdin.
+const STDIN_PATH: &str = "-";
+
+/// Reply written for each command in `--batch` mode (one JSON object per line).
+#[derive(serde::Serialize)]
+struct BatchReply {
+    returncode: i32,
+    stdout: String,
+    stderr: String,
+}
+
 fn main() {
     let args: Vec<String> = env::args().collect();
 
@@ -19,9 +34,16 @@ fn main() {
     let command = &args[1];
 
     match command.as_str() {
-        "convert" => handle_convert(&args[2..]),
-        "info" => handle_info(&args[2..]),
-        "validate" => handle_validate(&args[2..]),
+        "convert" | "info" | "validate" => {
+            let code = run_command(
+                &args[1..],
+                &mut io::stdin(),
+                &mut io::stdout(),
+                &mut io::stderr(),
+            );
+            process::exit(code);
+        }
+        "--batch" => process::exit(run_batch()),
         "geom" => process::exit(laykit::geom_cli::run(&args[2..])),
         "help" | "--help" | "-h" => print_usage(),
         _ => {
@@ -40,222 +62,440 @@ fn print_usage() {
     println!();
     println!("USAGE:");
     println!("    laykit <COMMAND> [OPTIONS]");
+    println!("    laykit --batch");
     println!();
     println!("COMMANDS:");
-    println!("    convert <INPUT> <OUTPUT>    Convert between GDSII and OASIS formats");
+    println!("    convert <INPUT> <OUTPUT>... Convert between GDSII and OASIS formats");
+    println!("                                (- as INPUT reads stdin; - as the last");
+    println!("                                OUTPUT with --format=gds|oas writes stdout)");
     println!("    info <FILE>                 Display file information");
     println!("    validate <FILE>             Validate file format and structure");
     println!("    geom <boolean|offset|slice|inside>  Geometry ops (JSON stdin, parity tests)");
     println!("    help                        Show this help message");
     println!();
+    println!("BATCH MODE:");
+    println!("    --batch reads one JSON argument array per stdin line, e.g.");
+    println!("    [\"info\", \"design.gds\"], and answers each with one JSON line");
+    println!("    {{\"returncode\": 0, \"stdout\": \"...\", \"stderr\": \"...\"}}.");
+    println!("    Supports convert, info and validate.");
+    println!();
     println!("EXAMPLES:");
     println!("    laykit convert input.gds output.oas");
     println!("    laykit convert input.oas output.gds");
+    println!("    laykit convert input.gds trip.oas back.gds   (chained round trip)");
+    println!("    laykit convert input.oas - --format=gds > output.gds");
+    println!("    laykit convert - output.oas < input.gds");
     println!("    laykit info design.gds");
     println!("    laykit validate layout.oas");
 }
 
-fn handle_convert(args: &[String]) {
-    if args.len() < 2 {
-        eprintln!("Error: convert command requires input and output file paths");
-        eprintln!("Usage: laykit convert <INPUT> <OUTPUT>");
-        process::exit(1);
-    }
+/// Run a `convert`, `info` or `validate` command, reading a `-` input from
+/// `input` and writing its output to `out`/`err`, and return the process
+/// exit code it maps to.
+fn run_command(
+    args: &[String],
+    input: &mut dyn Read,
+    out: &mut dyn Write,
+    err: &mut dyn Write,
+) -> i32 {
+    let result = match args[0].as_str() {
+        "convert" => handle_convert(&args[1..], input, out, err),
+        "info" => handle_info(&args[1..], out, err),
+        "validate" => handle_validate(&args[1..], out, err),
+        other => writeln!(err, "Unknown command: {}", other).map(|_| 1),
+    };
+    let code = result.unwrap_or(1);
+    let _ = out.flush();
+    let _ = err.flush();
+    code
+}
 
-    let input_path = &args[0];
-    let output_path = &args[1];
+/// Serve commands from stdin until EOF so callers can amortize process
+/// startup over many conversions.
+///
+/// Each request is a single line holding a JSON array of arguments (the
+/// command line without the program name). Each reply is a single
+/// [`BatchReply`] JSON line, flushed immediately.
+fn run_batch() -> i32 {
+    let stdin = io::stdin();
+    let mut replies = io::stdout().lock();
+
+    for line in stdin.lock().lines() {
+        let line = match line {
+            Ok(line) => line,
+            Err(e) => {
+                eprintln!("Error reading batch command: {}", e);
+                return 1;
+            }
+        };
+        if line.trim().is_empty() {
+            continue;
+        }
 
-    if !Path::new(input_path).exists() {
-        eprintln!("Error: Input file '{}' does not exist", input_path);
-        process::exit(1);
+        let mut out = Vec::new();
+        let mut err = Vec::new();
+        let returncode = match serde_json::from_str::<Vec<String>>(&line) {
+            // stdin carries the commands and replies are text, so binary
+            // layout data can neither be read nor returned inline
+            Ok(args)
+                if args
+                    .iter()
+                    .any(|arg| arg == STDOUT_PATH || arg == STDIN_PATH) =>
+            {
+                let _ = writeln!(
+                    err,
+                    "Error: '-' (stdin/stdout) is not supported in batch mode"
+                );
+                1
+            }
+            Ok(args) if !args.is_empty() => {
+                run_command(&args, &mut io::empty(), &mut out, &mut err)
+            }
+            Ok(_) => {
+                let _ = writeln!(err, "Error: empty batch command");
+                1
+            }
+            Err(e) => {
+                let _ = writeln!(err, "Error: invalid batch command: {}", e);
+                1
+            }
+        };
+
+        let reply = BatchReply {
+            returncode,
+            stdout: String::from_utf8_lossy(&out).into_owned(),
+            stderr: String::from_utf8_lossy(&err).into_owned(),
+        };
+        let sent = serde_json::to_writer(&mut replies, &reply)
+            .map_err(io::Error::from)
+            .and_then(|_| writeln!(replies))
+            .and_then(|_| replies.flush());
+        if let Err(e) = sent {
+            eprintln!("Error writing batch reply: {}", e);
+            return 1;
+        }
     }
 
-    // Detect input format by reading magic bytes
-    let input_format = match detect_format_from_file(input_path) {
-        Ok(format) => format,
-        Err(e) => {
-            eprintln!("Error: Cannot detect input file format: {}", e);
-            process::exit(1);
-        }
-    };
+    0
+}
 
-    // Detect output format by reading magic bytes (if file exists) or use extension as hint
-    let output_format = if Path::new(output_path).exists() {
-        match detect_format_from_file(output_path) {
-            Ok(format) => format,
-            Err(_) => {
-                // If we can't read the file, infer from extension
-                let ext = Path::new(output_path)
-                    .extension()
-                    .and_then(|s| s.to_str())
-                    .unwrap_or("")
-                    .to_lowercase();
-                match ext.as_str() {
-                    "gds" => FileFormat::GDSII,
-                    "oas" => FileFormat::OASIS,
-                    _ => FileFormat::Unknown,
+fn handle_convert(
+    args: &[String],
+    input: &mut dyn Read,
+    out: &mut dyn Write,
+    err: &mut dyn Write,
+) -> io::Result<i32> {
+    // `--format=` names the format written to `-` (stdout), which has no extension
+    let mut stdout_format = None;
+    let mut paths = Vec::with_capacity(args.len());
+    for arg in args {
+        match arg.strip_prefix("--format=") {
+            Some(value) => {
+                stdout_format = match value.to_lowercase().as_str() {
+                    "gds" | "gdsii" => Some(FileFormat::GDSII),
+                    "oas" | "oasis" => Some(FileFormat::OASIS),
+                    _ => {
+                        writeln!(
+                            err,
+                            "Error: Unknown output format '{}' (expected gds or oas)",
+                            value
+                        )?;
+                        return Ok(1);
+                    }
                 }
             }
+            None => paths.push(arg.as_str()),
         }
+    }
+
+    if paths.len() < 2 {
+        writeln!(
+            err,
+            "Error: convert command requires input and output file paths"
+        )?;
+        writeln!(
+            err,
+            "Usage: laykit convert <INPUT> <OUTPUT> [<OUTPUT>...] [--format=gds|oas]"
+        )?;
+        return Ok(1);
+    }
+
+    let input_path = paths[0];
+    let output_paths = &paths[1..];
+
+    if stdout_format.is_some() && output_paths.last() != Some(&STDOUT_PATH) {
+        writeln!(
+            err,
+            "Error: --format only applies when the last output is '-' (stdout)"
+        )?;
+        return Ok(1);
+    }
+
+    // `-` reads the whole layout from stdin up front; its format is
+    // detected from the same magic bytes as a file's.
+    let input_data = if input_path == STDIN_PATH {
+        let mut data = Vec::new();
+        input.read_to_end(&mut data)?;
+        Some(data)
     } else {
-        // Output file doesn't exist, infer from extension
-        let ext = Path::new(output_path)
-            .extension()
-            .and_then(|s| s.to_str())
-            .unwrap_or("")
-            .to_lowercase();
-        match ext.as_str() {
-            "gds" => FileFormat::GDSII,
-            "oas" => FileFormat::OASIS,
-            _ => FileFormat::Unknown,
+        if !Path::new(input_path).exists() {
+            writeln!(err, "Error: Input file '{}' does not exist", input_path)?;
+            return Ok(1);
         }
+        None
     };
 
-    println!("Converting {} -> {}", input_path, output_path);
-    println!("  Input format: {:?}", input_format);
-    println!("  Output format: {:?}", output_format);
-
-    let result = match (input_format, output_format) {
-        (FileFormat::GDSII, FileFormat::OASIS) => convert_gds_to_oas(input_path, output_path),
-        (FileFormat::OASIS, FileFormat::GDSII) => convert_oas_to_gds(input_path, output_path),
-        (FileFormat::GDSII, FileFormat::GDSII) => rewrite_gds(input_path, output_path),
-        (FileFormat::OASIS, FileFormat::OASIS) => rewrite_oasis(input_path, output_path),
-        (FileFormat::Unknown, _) => {
-            eprintln!("Error: Cannot determine input file format");
-            eprintln!("       File does not appear to be valid GDSII or OASIS");
-            process::exit(1);
-        }
-        (_, FileFormat::Unknown) => {
-            eprintln!("Error: Cannot determine output file format");
-            eprintln!("       Please use .gds or .oas extension for output file");
-            process::exit(1);
-        }
+    // Detect input format by reading magic bytes
+    let input_format = match &input_data {
+        Some(data) => detect_format_from_bytes(data),
+        None => match detect_format_from_file(input_path) {
+            Ok(format) => format,
+            Err(e) => {
+                writeln!(err, "Error: Cannot detect input file format: {}", e)?;
+                return Ok(1);
+            }
+        },
     };
 
-    match result {
-        Ok(_) => {
-            println!("✓ Conversion successful!");
-            if let Ok(metadata) = fs::metadata(output_path) {
-                println!("  Output size: {} bytes", metadata.len());
+    if input_format == FileFormat::Unknown {
+        writeln!(err, "Error: Cannot determine input file format")?;
+        writeln!(
+            err,
+            "       File does not appear to be valid GDSII or OASIS"
+        )?;
+        return Ok(1);
+    }
+
+    let mut output_formats = Vec::with_capacity(output_paths.len());
+    for (idx, output_path) in output_paths.iter().enumerate() {
+        let output_format = if *output_path == STDOUT_PATH {
+            if idx + 1 != output_paths.len() {
+                writeln!(err, "Error: '-' (stdout) must be the last output")?;
+                return Ok(1);
             }
+            match stdout_format {
+                Some(format) => format,
+                None => {
+                    writeln!(
+                        err,
+                        "Error: writing to '-' requires --format=gds or --format=oas"
+                    )?;
+                    return Ok(1);
+                }
+            }
+        } else {
+            detect_output_format(output_path)
+        };
+        if output_format == FileFormat::Unknown {
+            writeln!(err, "Error: Cannot determine output file format")?;
+            writeln!(
+                err,
+                "       Please use .gds or .oas extension for output file"
+            )?;
+            return Ok(1);
         }
+        output_formats.push(output_format);
+    }
+
+    let loaded = match &input_data {
+        Some(data) => LayoutFile::load_from_bytes(data),
+        None => load(input_path),
+    };
+    let mut layout = match loaded {
+        Ok(layout) => layout,
         Err(e) => {
-            eprintln!("✗ Conversion failed: {}", e);
-            process::exit(1);
+            writeln!(err, "✗ Conversion failed: {}", e)?;
+            return Ok(1);
         }
-    }
-}
+    };
 
-fn convert_gds_to_oas(input: &str, output: &str) -> Result<(), Box<dyn std::error::Error>> {
-    match load(input)? {
-        LayoutFile::Gdsii(gds) => {
-            let oasis = converter::gdsii_to_oasis(&gds)?;
-            oasis.write_to_file(output)?;
-            Ok(())
+    // When layout data goes to stdout, progress messages move to stderr.
+    let to_stdout = output_paths.last() == Some(&STDOUT_PATH);
+    let log: &mut dyn Write = if to_stdout { &mut *err } else { &mut *out };
+
+    // Each extra output is converted from the previous one, so
+    // `convert a.gds b.oas c.gds` is a GDS -> OASIS -> GDS round trip that
+    // reads the input only once.
+    let mut stdout_data = None;
+    let mut failure = None;
+    let mut source_path = input_path;
+    for (hop, (output_path, output_format)) in output_paths.iter().zip(output_formats).enumerate() {
+        writeln!(log, "Converting {} -> {}", source_path, output_path)?;
+        writeln!(log, "  Input format: {:?}", layout.format())?;
+        writeln!(log, "  Output format: {:?}", output_format)?;
+
+        let bytes = match convert_layout(&layout, output_format, output_path) {
+            Ok(bytes) => bytes,
+            Err(e) => {
+                failure = Some(e);
+                break;
+            }
+        };
+        if *output_path != STDOUT_PATH
+            && let Err(e) = fs::write(output_path, &bytes)
+        {
+            failure = Some(e.into());
+            break;
+        }
+        writeln!(log, "✓ Conversion successful!")?;
+        writeln!(log, "  Output size: {} bytes", bytes.len())?;
+
+        // Parse back what was written so the next hop sees exactly that
+        if hop + 1 < output_paths.len() {
+            layout = match LayoutFile::load_from_bytes(&bytes) {
+                Ok(layout) => layout,
+                Err(e) => {
+                    failure = Some(e.into());
+                    break;
+                }
+            };
+        } else if to_stdout {
+            stdout_data = Some(bytes);
         }
-        LayoutFile::Oasis(_) => Err("internal error: expected GDSII input".into()),
+        source_path = output_path;
     }
-}
 
-fn convert_oas_to_gds(input: &str, output: &str) -> Result<(), Box<dyn std::error::Error>> {
-    match load(input)? {
-        LayoutFile::Oasis(oasis) => {
-            let gds = converter::oasis_to_gdsii_with_name(&oasis, Some(output))?;
-            gds.write_to_file(output)?;
-            Ok(())
-        }
-        LayoutFile::Gdsii(_) => Err("internal error: expected OASIS input".into()),
+    if let Some(e) = failure {
+        writeln!(err, "✗ Conversion failed: {}", e)?;
+        return Ok(1);
+    }
+    if let Some(data) = stdout_data {
+        out.write_all(&data)?;
     }
+
+    Ok(0)
 }
 
-fn rewrite_gds(input: &str, output: &str) -> Result<(), Box<dyn std::error::Error>> {
-    match load(input)? {
-        LayoutFile::Gdsii(gds) => {
-            gds.write_to_file(output)?;
-            Ok(())
-        }
-        LayoutFile::Oasis(_) => Err("internal error: expected GDSII input".into()),
+/// Detect the format of an output path by reading magic bytes (if the file
+/// exists) or from its extension.
+fn detect_output_format(output_path: &str) -> FileFormat {
+    if Path::new(output_path).exists()
+        && let Ok(format) = detect_format_from_file(output_path)
+    {
+        return format;
+    }
+    // Output file doesn't exist or can't be read, infer from extension
+    let ext = Path::new(output_path)
+        .extension()
+        .and_then(|s| s.to_str())
+        .unwrap_or("")
+        .to_lowercase();
+    match ext.as_str() {
+        "gds" => FileFormat::GDSII,
+        "oas" => FileFormat::OASIS,
+        _ => FileFormat::Unknown,
     }
 }
 
-fn rewrite_oasis(input: &str, output: &str) -> Result<(), Box<dyn std::error::Error>> {
-    match load(input)? {
-        LayoutFile::Oasis(oasis) => {
-            oasis.write_to_file(output)?;
-            Ok(())
+/// Serialize `layout` as `format`. `output` only seeds the library name
+/// when an OASIS file without one is turned into GDSII.
+fn convert_layout(
+    layout: &LayoutFile,
+    format: FileFormat,
+    output: &str,
+) -> Result<Vec<u8>, Box<dyn std::error::Error>> {
+    let mut bytes = Vec::new();
+    match (layout, format) {
+        (LayoutFile::Gdsii(gds), FileFormat::OASIS) => {
+            converter::gdsii_to_oasis(gds)?.write_to_writer(&mut bytes)?
+        }
+        (LayoutFile::Oasis(oasis), FileFormat::GDSII) => {
+            let name_hint = (output != STDOUT_PATH).then_some(output);
+            converter::oasis_to_gdsii_with_name(oasis, name_hint)?.write_to_writer(&mut bytes)?
         }
-        LayoutFile::Gdsii(_) => Err("internal error: expected OASIS input".into()),
+        (LayoutFile::Gdsii(gds), FileFormat::GDSII) => gds.write_to_writer(&mut bytes)?,
+        (LayoutFile::Oasis(oasis), FileFormat::OASIS) => oasis.write_to_writer(&mut bytes)?,
+        (_, FileFormat::Unknown) => return Err("cannot determine output file format".into()),
     }
+    Ok(bytes)
 }
 
-fn handle_info(args: &[String]) {
+fn handle_info(args: &[String], out: &mut dyn Write, err: &mut dyn Write) -> io::Result<i32> {
     if args.is_empty() {
-        eprintln!("Error: info command requires a file path");
-        eprintln!("Usage: laykit info <FILE>");
-        process::exit(1);
+        writeln!(err, "Error: info command requires a file path")?;
+        writeln!(err, "Usage: laykit info <FILE>")?;
+        return Ok(1);
     }
 
     let file_path = &args[0];
 
     if !Path::new(file_path).exists() {
-        eprintln!("Error: File '{}' does not exist", file_path);
-        process::exit(1);
+        writeln!(err, "Error: File '{}' does not exist", file_path)?;
+        return Ok(1);
     }
 
     let layout = match load(file_path) {
         Ok(layout) => layout,
         Err(laykit::LaykitError::UnknownFormat) => {
-            eprintln!("Error: Unknown file format");
-            eprintln!("       File does not appear to be valid GDSII or OASIS");
-            process::exit(1);
+            writeln!(err, "Error: Unknown file format")?;
+            writeln!(
+                err,
+                "       File does not appear to be valid GDSII or OASIS"
+            )?;
+            return Ok(1);
         }
         Err(e) => {
-            eprintln!("Error reading file: {}", e);
-            process::exit(1);
+            writeln!(err, "Error reading file: {}", e)?;
+            return Ok(1);
         }
     };
 
     let result = match layout {
-        LayoutFile::Gdsii(gds) => print_gds_info(file_path, &gds),
-        LayoutFile::Oasis(oasis) => print_oas_info(file_path, &oasis),
+        LayoutFile::Gdsii(gds) => print_gds_info(file_path, &gds, out),
+        LayoutFile::Oasis(oasis) => print_oas_info(file_path, &oasis, out),
     };
 
     if let Err(e) = result {
-        eprintln!("Error displaying file info: {}", e);
-        process::exit(1);
+        writeln!(err, "Error displaying file info: {}", e)?;
+        return Ok(1);
     }
+
+    Ok(0)
 }
 
-fn print_gds_info(file_path: &str, gds: &GDSIIFile) -> Result<(), Box<dyn std::error::Error>> {
+fn print_gds_info(
+    file_path: &str,
+    gds: &GDSIIFile,
+    out: &mut dyn Write,
+) -> Result<(), Box<dyn std::error::Error>> {
     let metadata = fs::metadata(file_path)?;
 
-    println!("═══════════════════════════════════════════════════════");
-    println!("  GDSII File Information");
-    println!("═══════════════════════════════════════════════════════");
-    println!();
-    println!("File: {}", file_path);
-    println!(
+    writeln!(
+        out,
+        "═══════════════════════════════════════════════════════"
+    )?;
+    writeln!(out, "  GDSII File Information")?;
+    writeln!(
+        out,
+        "═══════════════════════════════════════════════════════"
+    )?;
+    writeln!(out)?;
+    writeln!(out, "File: {}", file_path)?;
+    writeln!(
+        out,
         "Size: {} bytes ({:.2} KB)",
         metadata.len(),
         metadata.len() as f64 / 1024.0
-    );
-    println!();
-    println!("Library: {}", gds.library_name);
-    println!("Version: {}", gds.version);
-    println!(
+    )?;
+    writeln!(out)?;
+    writeln!(out, "Library: {}", gds.library_name)?;
+    writeln!(out, "Version: {}", gds.version)?;
+    writeln!(
+        out,
         "Units: {:.3e} user, {:.3e} database (meters)",
         gds.units.0, gds.units.1
-    );
-    println!();
-    println!("Structures: {}", gds.structures.len());
-    println!();
+    )?;
+    writeln!(out)?;
+    writeln!(out, "Structures: {}", gds.structures.len())?;
+    writeln!(out)?;
 
     let mut total_elements = 0;
     let mut element_counts = std::collections::HashMap::new();
 
     for (idx, structure) in gds.structures.iter().enumerate() {
-        println!("  [{}] {}", idx + 1, structure.name);
-        println!(
+        writeln!(out, "  [{}] {}", idx + 1, structure.name)?;
+        writeln!(
+            out,
             "      Created: {:04}-{:02}-{:02} {:02}:{:02}:{:02}",
             structure.creation_time.year,
             structure.creation_time.month,
@@ -263,8 +503,8 @@ fn print_gds_info(file_path: &str, gds: &GDSIIFile) -> Result<(), Box<dyn std::e
             structure.creation_time.hour,
             structure.creation_time.minute,
             structure.creation_time.second
-        );
-        println!("      Elements: {}", structure.elements.len());
+        )?;
+        writeln!(out, "      Elements: {}", structure.elements.len())?;
         total_elements += structure.elements.len();
 
         for element in &structure.elements {
@@ -281,48 +521,59 @@ fn print_gds_info(file_path: &str, gds: &GDSIIFile) -> Result<(), Box<dyn std::e
         }
     }
 
-    println!();
-    println!("Total Elements: {}", total_elements);
+    writeln!(out)?;
+    writeln!(out, "Total Elements: {}", total_elements)?;
     if !element_counts.is_empty() {
-        println!();
-        println!("Element Breakdown:");
+        writeln!(out)?;
+        writeln!(out, "Element Breakdown:")?;
         let mut counts: Vec<_> = element_counts.iter().collect();
         counts.sort_by_key(|(_, count)| std::cmp::Reverse(**count));
         for (elem_type, count) in counts {
-            println!("  {:<12} {}", elem_type, count);
+            writeln!(out, "  {:<12} {}", elem_type, count)?;
         }
     }
-    println!();
+    writeln!(out)?;
 
     Ok(())
 }
 
-fn print_oas_info(file_path: &str, oasis: &OASISFile) -> Result<(), Box<dyn std::error::Error>> {
+fn print_oas_info(
+    file_path: &str,
+    oasis: &OASISFile,
+    out: &mut dyn Write,
+) -> Result<(), Box<dyn std::error::Error>> {
     let metadata = fs::metadata(file_path)?;
 
-    println!("═══════════════════════════════════════════════════════");
-    println!("  OASIS File Information");
-    println!("═══════════════════════════════════════════════════════");
-    println!();
-    println!("File: {}", file_path);
-    println!(
+    writeln!(
+        out,
+        "═══════════════════════════════════════════════════════"
+    )?;
+    writeln!(out, "  OASIS File Information")?;
+    writeln!(
+        out,
+        "═══════════════════════════════════════════════════════"
+    )?;
+    writeln!(out)?;
+    writeln!(out, "File: {}", file_path)?;
+    writeln!(
+        out,
         "Size: {} bytes ({:.2} KB)",
         metadata.len(),
         metadata.len() as f64 / 1024.0
-    );
-    println!();
-    println!("Version: {}", oasis.version);
-    println!("Unit: {:.3e} meters", oasis.unit);
-    println!();
-    println!("Cells: {}", oasis.cells.len());
-    println!();
+    )?;
+    writeln!(out)?;
+    writeln!(out, "Version: {}", oasis.version)?;
+    writeln!(out, "Unit: {:.3e} meters", oasis.unit)?;
+    writeln!(out)?;
+    writeln!(out, "Cells: {}", oasis.cells.len())?;
+    writeln!(out)?;
 
     let mut total_elements = 0;
     let mut element_counts = std::collections::HashMap::new();
 
     for (idx, cell) in oasis.cells.iter().enumerate() {
-        println!("  [{}] {}", idx + 1, cell.name);
-        println!("      Elements: {}", cell.elements.len());
+        writeln!(out, "  [{}] {}", idx + 1, cell.name)?;
+        writeln!(out, "      Elements: {}", cell.elements.len())?;
         total_elements += cell.elements.len();
 
         for element in &cell.elements {
@@ -340,52 +591,59 @@ fn print_oas_info(file_path: &str, oasis: &OASISFile) -> Result<(), Box<dyn std:
         }
     }
 
-    println!();
-    println!("Total Elements: {}", total_elements);
+    writeln!(out)?;
+    writeln!(out, "Total Elements: {}", total_elements)?;
     if !element_counts.is_empty() {
-        println!();
-        println!("Element Breakdown:");
+        writeln!(out)?;
+        writeln!(out, "Element Breakdown:")?;
         let mut counts: Vec<_> = element_counts.iter().collect();
         counts.sort_by_key(|(_, count)| std::cmp::Reverse(**count));
         for (elem_type, count) in counts {
-            println!("  {:<12} {}", elem_type, count);
+            writeln!(out, "  {:<12} {}", elem_type, count)?;
         }
     }
 
     if !oasis.names.cell_names.is_empty() {
-        println!();
-        println!("Name Table: {} cell names", oasis.names.cell_names.len());
+        writeln!(out)?;
+        writeln!(
+            out,
+            "Name Table: {} cell names",
+            oasis.names.cell_names.len()
+        )?;
     }
 
-    println!();
+    writeln!(out)?;
 
     Ok(())
 }
 
-fn handle_validate(args: &[String]) {
+fn handle_validate(args: &[String], out: &mut dyn Write, err: &mut dyn Write) -> io::Result<i32> {
     if args.is_empty() {
-        eprintln!("Error: validate command requires a file path");
-        eprintln!("Usage: laykit validate <FILE>");
-        process::exit(1);
+        writeln!(err, "Error: validate command requires a file path")?;
+        writeln!(err, "Usage: laykit validate <FILE>")?;
+        return Ok(1);
     }
 
     let file_path = &args[0];
 
     if !Path::new(file_path).exists() {
-        eprintln!("Error: File '{}' does not exist", file_path);
-        process::exit(1);
+        writeln!(err, "Error: File '{}' does not exist", file_path)?;
+        return Ok(1);
     }
 
     let layout = match load(file_path) {
         Ok(layout) => layout,
         Err(laykit::LaykitError::UnknownFormat) => {
-            eprintln!("Error: Unknown file format");
-            eprintln!("       File does not appear to be valid GDSII or OASIS");
-            process::exit(1);
+            writeln!(err, "Error: Unknown file format")?;
+            writeln!(
+                err,
+                "       File does not appear to be valid GDSII or OASIS"
+            )?;
+            return Ok(1);
         }
         Err(e) => {
-            eprintln!("Error reading file: {}", e);
-            process::exit(1);
+            writeln!(err, "Error reading file: {}", e)?;
+            return Ok(1);
         }
     };
 
@@ -396,28 +654,35 @@ fn handle_validate(args: &[String]) {
 
     match result {
         Ok(issues) => {
-            println!("═══════════════════════════════════════════════════════");
-            println!("  Validation Results");
-            println!("═══════════════════════════════════════════════════════");
-            println!();
-            println!("File: {}", file_path);
-            println!();
+            writeln!(
+                out,
+                "═══════════════════════════════════════════════════════"
+            )?;
+            writeln!(out, "  Validation Results")?;
+            writeln!(
+                out,
+                "═══════════════════════════════════════════════════════"
+            )?;
+            writeln!(out)?;
+            writeln!(out, "File: {}", file_path)?;
+            writeln!(out)?;
 
             if issues.is_empty() {
-                println!("✓ File is valid - no issues found");
-                println!();
+                writeln!(out, "✓ File is valid - no issues found")?;
+                writeln!(out)?;
             } else {
-                println!("⚠ Found {} issue(s):", issues.len());
-                println!();
+                writeln!(out, "⚠ Found {} issue(s):", issues.len())?;
+                writeln!(out)?;
                 for (idx, issue) in issues.iter().enumerate() {
-                    println!("  [{}] {}", idx + 1, issue);
+                    writeln!(out, "  [{}] {}", idx + 1, issue)?;
                 }
-                println!();
+                writeln!(out)?;
             }
+            Ok(0)
         }
         Err(e) => {
-            eprintln!("✗ Validation failed: {}", e);
-            process::exit(1);
+            writeln!(err, "✗ Validation failed: {}", e)?;
+            Ok(1)
         }
     }
 }
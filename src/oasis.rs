@@ -499,19 +499,26 @@ impl OASISFile {
             }
         }
 
-        for (ref_num, string) in &names.text_strings {
+        // Name tables are written in ref-number order so the output is deterministic
+        let mut text_string_entries: Vec<_> = names.text_strings.iter().collect();
+        text_string_entries.sort_by_key(|(k, _)| *k);
+        for (ref_num, string) in text_string_entries {
             Self::write_u8(writer, 5)?; // TEXTSTRING
             Self::write_string(writer, string)?;
             Self::write_unsigned(writer, *ref_num as u64)?;
         }
 
-        for (ref_num, name) in &prop_names {
+        let mut prop_name_entries: Vec<_> = prop_names.iter().collect();
+        prop_name_entries.sort_by_key(|(k, _)| *k);
+        for (ref_num, name) in prop_name_entries {
             Self::write_u8(writer, 7)?; // PROPNAME
             Self::write_string(writer, name)?;
             Self::write_unsigned(writer, *ref_num as u64)?;
         }
 
-        for (ref_num, string) in &prop_strings {
+        let mut prop_string_entries: Vec<_> = prop_strings.iter().collect();
+        prop_string_entries.sort_by_key(|(k, _)| *k);
+        for (ref_num, string) in prop_string_entries {
             Self::write_u8(writer, 9)?; // PROPSTRING
             Self::write_string(writer, string)?;
             Self::write_unsigned(writer, *ref_num as u64)?;
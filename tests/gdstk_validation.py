@@ -8,11 +8,21 @@ This script validates that LayKit can:
 3. Produce identical results for round-trip conversions
 """
 
+import argparse
+import atexit
+import hashlib
+import json
 import os
+import re
 import sys
+import selectors
 import subprocess
 import tempfile
+import time
 import shutil
+from collections import namedtuple
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 try:
     import gdstk
@@ -20,803 +30,1071 @@ except ImportError:
     print("ERROR: gdstk not installed. Install with: pip install gdstk")
     sys.exit(1)
 
-LAYKIT_BIN = os.path.join(os.path.dirname(__file__), "../target/release/laykit")
+import numpy as np  # always available: gdstk depends on it
+
+LAYKIT_BIN = os.path.abspath(os.path.join(os.path.dirname(__file__), "../target/release/laykit"))
+# Stat the binary once; None means it has not been built
+_LAYKIT_STAT = os.stat(LAYKIT_BIN) if os.path.exists(LAYKIT_BIN) else None
+
+# Environment for laykit spawns: it needs none of ours, so don't copy it all
+# into every child. SYSTEMROOT is required for processes to start on Windows.
+_MIN_ENV = {"PATH": os.environ.get("PATH", ""), "HOME": os.environ.get("HOME", "/tmp")}
+if "SYSTEMROOT" in os.environ:
+    _MIN_ENV["SYSTEMROOT"] = os.environ["SYSTEMROOT"]
+
+# Seconds a laykit command may run before it is killed and failed
+LAYKIT_TIMEOUT = 60
+
+# Pass/fail results of the last run, keyed on everything that can change them
+CACHE_FILE = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "laykit", "validation.json"
+)
+
+# Outcome of one test: its description, whether it passed and why not
+Result = namedtuple("Result", "name ok detail")
+
+# Fixtures are small and short-lived; keep them on tmpfs when available so
+# the gdstk -> laykit -> gdstk round trips never wait on disk writeback.
+SHM = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+
+def _build_base_cell():
+    """Build the cell shared by fixtures: a 100x100 rectangle on layer 1/0."""
+    cell = gdstk.Cell("BASE")
+    cell.add(gdstk.rectangle((0, 0), (100, 100), layer=1, datatype=0))
+    return cell
+
+_BASE_CELL = _build_base_cell()
+
+@dataclass(frozen=True)
+class Expect:
+    """What a library must read back as: the facts tests assert on."""
+    cells: frozenset
+    polygons: int
+    labels: int
+    layers: frozenset  # (layer, datatype) of every polygon
+
+    @classmethod
+    def of(cls, lib):
+        """Take the expectations from a gdstk library (paths count as polygons)."""
+        polygons = [p for c in lib.cells for p in c.get_polygons(depth=0)]
+        return cls(
+            cells=frozenset(cells_by_name(lib)),
+            polygons=len(polygons),
+            labels=sum(len(c.labels) for c in lib.cells),
+            layers=frozenset((p.layer, p.datatype) for p in polygons),
+        )
+
+    def mismatch(self, lib):
+        """Return a failure detail if lib does not match, else None."""
+        got = Expect.of(lib)
+        if got == self:
+            return None
+        return f"Expected {self}, got {got}"
+
+def add_refs(cell, base, transforms):
+    """Add one reference to base per transform (Reference keyword arguments)."""
+    cell.add(*[gdstk.Reference(base, **kwargs) for kwargs in transforms])
+
+def new_fixture_library(lib_name, cell_name):
+    """Return (lib, cell) where cell is a deep copy of the shared base cell.
+
+    gdstk libraries cannot be deep-copied, so the common content lives in a
+    prebuilt cell and only the cheap Library shell is created per test.
+    """
+    lib = gdstk.Library(lib_name, unit=1e-6, precision=1e-9)
+    cell = _BASE_CELL.copy(cell_name)
+    lib.add(cell)
+    return lib, cell
+
+def cells_by_name(lib):
+    """Return {cell name: cell} for a gdstk library."""
+    return {c.name: c for c in lib.cells}
+
+def _canon_shapes(cell, decimals=9):
+    """Return (polygons, labels) of cell in an order-independent canonical form.
+
+    Each polygon becomes its sorted, rounded vertex tuple and each label a
+    (text, origin, layer, texttype) tuple; both lists are sorted, so two cells
+    holding the same shapes compare equal however they were written out.
+    Rounding only removes float noise; it does not snap to the database
+    grid, so source shapes compared this way should already lie on it.
+    Paths are compared by their polygon outline, so a path that comes back
+    as a boundary still matches. References are not followed.
+    """
+    polys = sorted(
+        tuple(sorted(map(tuple, np.round(p.points, decimals).tolist())))
+        for p in cell.get_polygons(depth=0)
+    )
+    labels = sorted(
+        (l.text, tuple(np.round(l.origin, decimals).tolist()), l.layer, l.texttype)
+        for l in cell.labels
+    )
+    return polys, labels
+
+def _file_digest(path):
+    """Return (size, blake2b hex digest) of a file's contents."""
+    with open(path, "rb") as f:
+        data = f.read()
+    return len(data), hashlib.blake2b(data).hexdigest()
+
+class LaykitDaemon:
+    """A single ``laykit --batch`` process that serves every test command.
+
+    Commands go to the child as one JSON argument array per line; each reply
+    is one JSON line holding ``returncode``, ``stdout`` and ``stderr``.
+    Output is handed back as bytes, like the one-shot path.
+    """
+
+    def __init__(self, proc):
+        self.proc = proc
+        self.pending = b""  # bytes read past the end of the last reply
+        # Raises OSError where pipes cannot be selected (Windows), which
+        # start() treats like a binary without batch mode
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(proc.stdout, selectors.EVENT_READ)
+
+    @classmethod
+    def start(cls):
+        """Start the daemon, or return None if the binary lacks ``--batch``."""
+        proc = subprocess.Popen(
+            [LAYKIT_BIN, "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=_MIN_ENV,
+            close_fds=True
+        )
+        try:
+            daemon = cls(proc)
+        except OSError:
+            proc.kill()
+            proc.communicate()
+            return None
+        try:
+            # An empty command is a cheap handshake: batch mode answers it
+            # with an error reply, older binaries print usage and exit.
+            daemon.call([])
+        except (OSError, EOFError, ValueError, KeyError):
+            daemon.close()
+            return None
+        return daemon
+
+    def call(self, args):
+        """Run one laykit command and return (returncode, stdout, stderr)."""
+        self.proc.stdin.write(json.dumps(args).encode() + b"\n")
+        self.proc.stdin.flush()
+        reply = json.loads(self._read_line())
+        return reply["returncode"], reply["stdout"].encode(), reply["stderr"].encode()
+
+    def _read_line(self):
+        """Return the next reply line, killing the daemon after LAYKIT_TIMEOUT.
+
+        Reads bypass proc.stdout's buffer and go to its file descriptor:
+        bytes parked in that buffer would be invisible to the selector.
+        """
+        deadline = time.monotonic() + LAYKIT_TIMEOUT
+        while b"\n" not in self.pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self.selector.select(remaining):
+                self.proc.kill()
+                raise EOFError(f"laykit --batch timed out after {LAYKIT_TIMEOUT}s")
+            chunk = os.read(self.proc.stdout.fileno(), 65536)
+            if not chunk:
+                raise EOFError("laykit --batch exited unexpectedly")
+            self.pending += chunk
+        line, _, self.pending = self.pending.partition(b"\n")
+        return line
+
+    def close(self):
+        """Close the command stream, wait for the daemon to exit and close its output."""
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+        self.selector.close()
+        self.proc.stdout.close()
+
+# One daemon per process, started on first use; LAYKIT_SERVER=0 opts out and
+# spawns one laykit process per command instead. The pid is tracked because
+# a forked child must not share its parent's pipes.
+_DAEMON = None
+_DAEMON_PID = None
+
+def get_daemon():
+    """Return this process's laykit daemon, starting it on first use.
+
+    Returns None when disabled via LAYKIT_SERVER=0 or when the binary has no
+    batch mode; a failed start is not retried until _drop_daemon is called.
+    """
+    global _DAEMON, _DAEMON_PID
+    if os.environ.get("LAYKIT_SERVER") == "0":
+        return None
+    if _DAEMON_PID != os.getpid():
+        _DAEMON_PID = os.getpid()
+        _DAEMON = LaykitDaemon.start()
+        if _DAEMON is not None:
+            atexit.register(_DAEMON.close)
+    return _DAEMON
+
+def _drop_daemon(daemon):
+    """Stop a daemon that broke mid-command and return its exit status.
+
+    The next get_daemon call starts a fresh one, so a laykit crash fails only
+    the command it happened on.
+    """
+    global _DAEMON, _DAEMON_PID
+    daemon.close()
+    _DAEMON = _DAEMON_PID = None
+    return daemon.proc.returncode
+
+# Every token the tests look for in `laykit info` output, matched in one pass
+_INFO_NEEDLES = re.compile(rb"TESTLIB|TOP|LARGE|1000")
+
+def _missing_needles(data, needles):
+    """Return the set of needles not found in data, scanning it only until all are seen."""
+    remaining = set(needles)
+    for match in _INFO_NEEDLES.finditer(data):
+        remaining.discard(match.group())
+        if not remaining:
+            break
+    return remaining
 
 def run_laykit(args):
-    """Run laykit command and return output."""
-    result = subprocess.run(
+    """Run laykit command and return (returncode, stdout, stderr) as bytes.
+
+    Output is only ever searched for ASCII tokens, so it is not decoded;
+    callers decode stderr when they print a failure.
+    """
+    daemon = get_daemon()
+    if daemon is not None:
+        try:
+            return daemon.call(args)
+        except (OSError, EOFError, ValueError, KeyError) as e:
+            status = _drop_daemon(daemon)
+            # A daemon that exits cleanly mid-command still failed this one
+            return status or 1, b"", f"{e} (exit status {status})\n".encode()
+    return _run_laykit_once(args)
+
+def _communicate(proc):
+    """Return proc's (stdout, stderr) once it exits, killing it after LAYKIT_TIMEOUT.
+
+    A killed laykit has a negative returncode, and stderr says why.
+    """
+    try:
+        return proc.communicate(timeout=LAYKIT_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        stdout, stderr = proc.communicate()
+        return stdout, (stderr or b"") + f"laykit timed out after {LAYKIT_TIMEOUT}s\n".encode()
+
+def _run_laykit_once(args):
+    """Spawn laykit for one command; see run_laykit. Output is bytes."""
+    proc = subprocess.Popen(
         [LAYKIT_BIN] + args,
-        capture_output=True,
-        text=True
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=_MIN_ENV,
+        close_fds=True
     )
-    return result.returncode, result.stdout, result.stderr
+    stdout, stderr = _communicate(proc)
+    return proc.returncode, stdout, stderr
 
-def test_read_gdstk_file():
+def test_read_gdstk_file(tmpdir):
     """Test that LayKit can read a file created by gdstk."""
-    print("Test 1: LayKit reading gdstk-created file... ", end="")
+    name = "LayKit reading gdstk-created file"
     
-    with tempfile.TemporaryDirectory() as tmpdir:
-        gds_file = os.path.join(tmpdir, "gdstk_test.gds")
-        
-        # Create a GDSII file with gdstk
-        lib = gdstk.Library("TESTLIB", unit=1e-6, precision=1e-9)
-        cell = lib.new_cell("TOP")
-        
-        # Add a rectangle
-        rect = gdstk.rectangle((0, 0), (100, 100), layer=1, datatype=0)
-        cell.add(rect)
-        
-        # Add a path
-        path = gdstk.FlexPath([(0, 0), (50, 0), (50, 50)], 10, layer=2, datatype=0)
-        cell.add(path)
-        
-        # Add text
-        text = gdstk.Label("TEST", (25, 25), layer=3, texttype=0)
-        cell.add(text)
-        
-        # Add reference
-        subcell = lib.new_cell("SUBCELL")
-        subrect = gdstk.rectangle((0, 0), (20, 20), layer=1, datatype=0)
-        subcell.add(subrect)
-        ref = gdstk.Reference(subcell, (75, 75))
-        cell.add(ref)
-        
-        lib.write_gds(gds_file)
-        
-        # Try to read with LayKit
-        returncode, stdout, stderr = run_laykit(["info", gds_file])
-        
-        if returncode != 0:
-            print(f"FAIL\n  Error: {stderr}")
-            return False
-        
-        # Validate output
-        if "TESTLIB" not in stdout or "TOP" not in stdout:
-            print(f"FAIL\n  Output missing expected content: {stdout}")
-            return False
-        
-        print("PASS")
-        return True
+    gds_file = os.path.join(tmpdir, "gdstk_test.gds")
+    
+    # Create a GDSII file with gdstk (the base cell supplies the rectangle)
+    lib, cell = new_fixture_library("TESTLIB", "TOP")
+    
+    # A subcell to reference
+    subcell = lib.new_cell("SUBCELL")
+    subcell.add(gdstk.rectangle((0, 0), (20, 20), layer=1, datatype=0))
+    
+    # Add a path, text and a reference in one call
+    cell.add(
+        gdstk.FlexPath([(0, 0), (50, 0), (50, 50)], 10, layer=2, datatype=0),
+        gdstk.Label("TEST", (25, 25), layer=3, texttype=0),
+        gdstk.Reference(subcell, (75, 75)),
+    )
+    
+    lib.write_gds(gds_file)
+    
+    # Try to read with LayKit
+    returncode, stdout, stderr = run_laykit(["info", gds_file])
+    
+    if returncode != 0:
+        return Result(name, False, f"Error: {stderr.decode('utf-8', 'replace')}")
+    
+    # Validate output
+    if _missing_needles(stdout, (b"TESTLIB", b"TOP")):
+        return Result(name, False, f"Output missing expected content: {stdout.decode('utf-8', 'replace')}")
+    
+    return Result(name, True, "")
 
-def test_write_for_gdstk():
+def test_write_for_gdstk(tmpdir):
     """Test that gdstk can read a file created by LayKit."""
-    print("Test 2: gdstk reading LayKit-created file... ", end="")
+    name = "gdstk reading LayKit-created file"
     
-    with tempfile.TemporaryDirectory() as tmpdir:
-        gds_file = os.path.join(tmpdir, "laykit_test.gds")
-        
-        # First, create a reference file with gdstk
-        ref_file = os.path.join(tmpdir, "reference.gds")
-        lib = gdstk.Library("LAYKIT_TEST", unit=1e-6, precision=1e-9)
-        cell = lib.new_cell("MAIN")
-        
-        # Add simple geometry
-        rect = gdstk.rectangle((0, 0), (1000, 1000), layer=1, datatype=0)
-        cell.add(rect)
+    # First, create a reference file with gdstk
+    ref_file = os.path.join(tmpdir, "reference.gds")
+    lib = gdstk.Library("LAYKIT_TEST", unit=1e-6, precision=1e-9)
+    cell = lib.new_cell("MAIN")
+    
+    # Add simple geometry on two layers
+    cell.add(
+        gdstk.rectangle((0, 0), (1000, 1000), layer=1, datatype=0),
+        gdstk.Polygon([(100, 100), (900, 100), (900, 900), (100, 900)], layer=2, datatype=0),
+    )
+    
+    lib.write_gds(ref_file)
+    
+    # Convert with LayKit (round-trip)
+    gds_out = os.path.join(tmpdir, "laykit_out.gds")
+    returncode, _, stderr = run_laykit(["convert", ref_file, gds_out])
+    
+    if returncode != 0:
+        return Result(name, False, f"LayKit convert error: {stderr.decode('utf-8', 'replace')}")
+    
+    # Check what gdstk read
+    try:
+        # Only the layers that were written are turned into Python objects
+        lib_read = gdstk.read_gds(gds_out, filter={(1, 0), (2, 0)})
+        cells = cells_by_name(lib_read)
         
-        polygon = gdstk.Polygon(
-            [(100, 100), (900, 100), (900, 900), (100, 900)],
-            layer=2, datatype=0
-        )
-        cell.add(polygon)
+        if lib_read.name != "LAYKIT_TEST":
+            return Result(name, False, f"Library name mismatch: {lib_read.name}")
         
-        lib.write_gds(ref_file)
+        if "MAIN" not in cells:
+            return Result(name, False, f"Cell 'MAIN' not found")
         
-        # Convert with LayKit (round-trip)
-        returncode, _, stderr = run_laykit(["convert", ref_file, gds_file])
+        main_cell = cells["MAIN"]
+        if len(main_cell.polygons) < 2:
+            return Result(name, False, f"Expected at least 2 polygons, got {len(main_cell.polygons)}")
         
-        if returncode != 0:
-            print(f"FAIL\n  LayKit convert error: {stderr}")
-            return False
+        return Result(name, True, "")
         
-        # Try to read with gdstk
-        try:
-            lib_read = gdstk.read_gds(gds_file)
-            
-            if lib_read.name != "LAYKIT_TEST":
-                print(f"FAIL\n  Library name mismatch: {lib_read.name}")
-                return False
-            
-            if "MAIN" not in [c.name for c in lib_read.cells]:
-                print(f"FAIL\n  Cell 'MAIN' not found")
-                return False
-            
-            main_cell = lib_read.cells[0]
-            if len(main_cell.polygons) < 2:
-                print(f"FAIL\n  Expected at least 2 polygons, got {len(main_cell.polygons)}")
-                return False
-            
-            print("PASS")
-            return True
-            
-        except Exception as e:
-            print(f"FAIL\n  gdstk read error: {e}")
-            return False
-
-def test_gds_to_oasis_conversion():
+    except Exception as e:
+        return Result(name, False, f"gdstk read error: {e}")
+
+def test_gds_to_oasis_conversion(tmpdir):
     """Test GDSII to OASIS conversion compatibility."""
-    print("Test 3: GDS→OASIS conversion validation... ", end="")
+    name = "GDS→OASIS conversion validation"
     
-    with tempfile.TemporaryDirectory() as tmpdir:
-        gds_file = os.path.join(tmpdir, "source.gds")
-        oas_file = os.path.join(tmpdir, "converted.oas")
-        gds_back = os.path.join(tmpdir, "roundtrip.gds")
-        
-        # Create a complex GDSII file
-        lib = gdstk.Library("CONVERT_TEST", unit=1e-6, precision=1e-9)
-        cell = lib.new_cell("COMPLEX")
-        
-        # Add various elements
-        rect = gdstk.rectangle((0, 0), (500, 500), layer=1, datatype=0)
-        cell.add(rect)
-        
-        path = gdstk.FlexPath([(100, 100), (400, 100), (400, 400)], 20, layer=2)
-        cell.add(path)
+    gds_file = os.path.join(tmpdir, "source.gds")
+    oas_file = os.path.join(tmpdir, "converted.oas")
+    gds_back = os.path.join(tmpdir, "roundtrip.gds")
+    
+    # Create a complex GDSII file
+    lib = gdstk.Library("CONVERT_TEST", unit=1e-6, precision=1e-9)
+    cell = lib.new_cell("COMPLEX")
+    
+    # Add various elements
+    cell.add(
+        gdstk.rectangle((0, 0), (500, 500), layer=1, datatype=0),
+        gdstk.FlexPath([(100, 100), (400, 100), (400, 400)], 20, layer=2),
+        gdstk.Label("CONVERT", (250, 250), layer=10, texttype=5),
+    )
+    
+    lib.write_gds(gds_file)
+    
+    # Convert GDS → OASIS → GDS in one laykit run (chained outputs)
+    returncode, _, stderr = run_laykit(["convert", gds_file, oas_file, gds_back])
+    if returncode != 0:
+        return Result(name, False, f"GDS→OASIS→GDS error: {stderr.decode('utf-8', 'replace')}")
+    
+    # Verify round-trip with gdstk
+    try:
+        lib_back = gdstk.read_gds(gds_back)
         
-        text = gdstk.Label("CONVERT", (250, 250), layer=10, texttype=5)
-        cell.add(text)
+        # Library name must match the source (gdstk preserves LIBNAME on round-trip)
+        if lib_back.name != "CONVERT_TEST":
+            return Result(name, False, f"Library name incorrect: expected 'CONVERT_TEST', got '{lib_back.name}'")
         
-        lib.write_gds(gds_file)
+        cell_back = cells_by_name(lib_back).get("COMPLEX")
+        if cell_back is None:
+            return Result(name, False, f"Cell lost in conversion")
         
-        # Convert GDS → OASIS
-        returncode, _, stderr = run_laykit(["convert", gds_file, oas_file])
-        if returncode != 0:
-            print(f"FAIL\n  GDS→OASIS error: {stderr}")
-            return False
+        # Rectangle, path outline and label must survive unchanged (in any order)
+        expected, actual = _canon_shapes(cell), _canon_shapes(cell_back)
+        if actual != expected:
+            return Result(name, False, f"Shapes changed: expected {expected}, got {actual}")
         
-        # Convert OASIS → GDS
-        returncode, _, stderr = run_laykit(["convert", oas_file, gds_back])
-        if returncode != 0:
-            print(f"FAIL\n  OASIS→GDS error: {stderr}")
-            return False
+        return Result(name, True, "")
         
-        # Verify round-trip with gdstk
-        try:
-            lib_back = gdstk.read_gds(gds_back)
-            
-            # Library name must match the source (gdstk preserves LIBNAME on round-trip)
-            if lib_back.name != "CONVERT_TEST":
-                print(f"FAIL\n  Library name incorrect: expected 'CONVERT_TEST', got '{lib_back.name}'")
-                return False
-            
-            if "COMPLEX" not in [c.name for c in lib_back.cells]:
-                print(f"FAIL\n  Cell lost in conversion")
-                return False
-            
-            cell_back = lib_back.cells[0]
-            element_count = len(cell_back.polygons) + len(cell_back.labels)
-            
-            if element_count < 2:  # At least rect and text
-                print(f"FAIL\n  Elements lost: {element_count}")
-                return False
-            
-            print("PASS")
-            return True
-            
-        except Exception as e:
-            print(f"FAIL\n  Round-trip validation error: {e}")
-            return False
-
-def test_properties():
+    except Exception as e:
+        return Result(name, False, f"Round-trip validation error: {e}")
+
+def test_properties(tmpdir):
     """Test property handling."""
-    print("Test 4: Property preservation... ", end="")
+    name = "Property preservation"
     
-    with tempfile.TemporaryDirectory() as tmpdir:
-        gds_file = os.path.join(tmpdir, "props.gds")
-        gds_out = os.path.join(tmpdir, "props_out.gds")
-        
-        # Create file with properties
-        lib = gdstk.Library("PROPS_TEST", unit=1e-6, precision=1e-9)
-        cell = lib.new_cell("WITHPROPS")
+    gds_file = os.path.join(tmpdir, "props.gds")
+    gds_out = os.path.join(tmpdir, "props_out.gds")
+    
+    # Create a library with properties
+    lib, cell = new_fixture_library("PROPS_TEST", "WITHPROPS")
+    
+    rect = cell.polygons[0]
+    rect.set_gds_property(1, "test_value")
+    rect.set_gds_property(42, "numeric_attr")
+    
+    lib.write_gds(gds_file)
+    
+    # Round-trip through LayKit
+    returncode, _, stderr = run_laykit(["convert", gds_file, gds_out])
+    if returncode != 0:
+        return Result(name, False, f"Conversion error: {stderr.decode('utf-8', 'replace')}")
+    
+    # Read back only the rectangle's layer and check its properties
+    try:
+        lib_back = gdstk.read_gds(gds_out, filter={(1, 0)})
+        cell_back = lib_back.cells[0]
         
-        rect = gdstk.rectangle((0, 0), (100, 100), layer=1, datatype=0)
-        rect.set_gds_property(1, "test_value")
-        rect.set_gds_property(42, "numeric_attr")
-        cell.add(rect)
+        if len(cell_back.polygons) == 0:
+            return Result(name, False, f"No polygons in output")
         
-        lib.write_gds(gds_file)
+        poly = cell_back.polygons[0]
+        props = poly.properties
         
-        # Round-trip through LayKit
-        returncode, _, stderr = run_laykit(["convert", gds_file, gds_out])
-        if returncode != 0:
-            print(f"FAIL\n  Conversion error: {stderr}")
-            return False
+        if props is None or len(props) < 2:
+            return Result(name, False, f"Expected 2 GDS properties, got {len(props) if props else 0}")
+
+        attrs = {p[1] for p in props if len(p) >= 2 and p[0] == "S_GDS_PROPERTY"}
+        if attrs != {1, 42}:
+            return Result(name, False, f"Property attributes mismatch: {attrs}")
+
+        return Result(name, True, "")
         
-        # Read back and check properties
-        try:
-            lib_back = gdstk.read_gds(gds_out)
-            cell_back = lib_back.cells[0]
-            
-            if len(cell_back.polygons) == 0:
-                print(f"FAIL\n  No polygons in output")
-                return False
-            
-            poly = cell_back.polygons[0]
-            props = poly.properties
-            
-            if props is None or len(props) < 2:
-                print(f"FAIL\n  Expected 2 GDS properties, got {len(props) if props else 0}")
-                return False
-
-            attrs = {p[1] for p in props if len(p) >= 2 and p[0] == "S_GDS_PROPERTY"}
-            if attrs != {1, 42}:
-                print(f"FAIL\n  Property attributes mismatch: {attrs}")
-                return False
-
-            print("PASS")
-            return True
-            
-        except Exception as e:
-            print(f"FAIL\n  Property validation error: {e}")
-            return False
-
-def test_array_references():
+    except Exception as e:
+        return Result(name, False, f"Property validation error: {e}")
+
+def test_array_references(tmpdir):
     """Test array reference handling."""
-    print("Test 5: Array reference (AREF) handling... ", end="")
+    name = "Array reference (AREF) handling"
     
-    with tempfile.TemporaryDirectory() as tmpdir:
-        gds_file = os.path.join(tmpdir, "array.gds")
-        gds_out = os.path.join(tmpdir, "array_out.gds")
-        
-        # Create file with array reference
-        lib = gdstk.Library("ARRAY_TEST", unit=1e-6, precision=1e-9)
-        
-        # Create subcell
-        subcell = lib.new_cell("UNIT")
-        unit_rect = gdstk.rectangle((0, 0), (10, 10), layer=1)
-        subcell.add(unit_rect)
-        
-        # Create main cell with array
-        main = lib.new_cell("MAIN")
-        array_ref = gdstk.Reference(subcell, (0, 0), columns=5, rows=3, spacing=(20, 20))
-        main.add(array_ref)
-        
-        lib.write_gds(gds_file)
-        
-        # Process with LayKit
-        returncode, _, stderr = run_laykit(["convert", gds_file, gds_out])
-        if returncode != 0:
-            print(f"FAIL\n  Conversion error: {stderr}")
-            return False
-        
-        # Verify with gdstk
-        try:
-            lib_back = gdstk.read_gds(gds_out)
-            
-            if len(lib_back.cells) < 2:
-                print(f"FAIL\n  Expected 2 cells, got {len(lib_back.cells)}")
-                return False
-            
-            # Find main cell
-            main_back = next((c for c in lib_back.cells if c.name == "MAIN"), None)
-            if not main_back:
-                print(f"FAIL\n  MAIN cell not found")
-                return False
-            
-            # Check for references (could be expanded or kept as array)
-            has_refs = len(main_back.references) > 0
-            has_polys = len(main_back.polygons) > 0
-            
-            if not (has_refs or has_polys):
-                print(f"FAIL\n  No content in MAIN cell")
-                return False
-            
-            print("PASS")
-            return True
-            
-        except Exception as e:
-            print(f"FAIL\n  Array validation error: {e}")
-            return False
-
-def test_large_file():
+    gds_file = os.path.join(tmpdir, "array.gds")
+    gds_out = os.path.join(tmpdir, "array_out.gds")
+    
+    # Create a library with an array reference
+    lib = gdstk.Library("ARRAY_TEST", unit=1e-6, precision=1e-9)
+    
+    # Create subcell
+    subcell = lib.new_cell("UNIT")
+    unit_rect = gdstk.rectangle((0, 0), (10, 10), layer=1)
+    subcell.add(unit_rect)
+    
+    # Create main cell with array
+    main = lib.new_cell("MAIN")
+    array_ref = gdstk.Reference(subcell, (0, 0), columns=5, rows=3, spacing=(20, 20))
+    main.add(array_ref)
+    
+    # Expected instance origins of the 5x3 array, sorted row-wise
+    gx, gy = np.meshgrid(np.arange(5) * 20, np.arange(3) * 20)
+    origins = np.unique(np.stack([gx.ravel(), gy.ravel()], -1), axis=0)
+    
+    lib.write_gds(gds_file)
+    
+    # Process with LayKit
+    returncode, _, stderr = run_laykit(["convert", gds_file, gds_out])
+    if returncode != 0:
+        return Result(name, False, f"Conversion error: {stderr.decode('utf-8', 'replace')}")
+    
+    # Verify with gdstk
+    try:
+        lib_back = gdstk.read_gds(gds_out)
+        
+        if len(lib_back.cells) < 2:
+            return Result(name, False, f"Expected 2 cells, got {len(lib_back.cells)}")
+        
+        # Find main cell
+        cells = cells_by_name(lib_back)
+        main_back = cells.get("MAIN")
+        if not main_back:
+            return Result(name, False, f"MAIN cell not found")
+        
+        unit_back = cells.get("UNIT")
+        if unit_back is None or _canon_shapes(unit_back) != _canon_shapes(subcell):
+            return Result(name, False, "UNIT cell shapes changed")
+        
+        # The array is either kept as one 5x3 reference or expanded into
+        # one rectangle per instance; both must land on the same origins.
+        if len(main_back.references) == 1:
+            ref = main_back.references[0]
+            rep = getattr(ref, "repetition", None)
+            shape = (getattr(rep, "columns", None), getattr(rep, "rows", None))
+            if shape != (5, 3):
+                return Result(name, False, f"Expected a 5x3 array reference, got {shape[0]}x{shape[1]}")
+            placed = np.asarray(ref.origin) + rep.get_offsets()
+        elif len(main_back.polygons) == len(origins):
+            if _canon_shapes(main_back) != _canon_shapes(main.copy("FLAT").flatten()):
+                return Result(name, False, "Expanded array does not match the flattened source")
+            placed = np.array([p.points.min(axis=0) for p in main_back.polygons])
+        else:
+            return Result(
+                name, False,
+                f"Expected one array reference or {len(origins)} polygons, got "
+                f"{len(main_back.references)} references and {len(main_back.polygons)} polygons"
+            )
+        
+        if not np.array_equal(np.unique(np.round(placed), axis=0), origins):
+            return Result(name, False, f"Array instances misplaced: {placed.tolist()}")
+        
+        return Result(name, True, "")
+        
+    except Exception as e:
+        return Result(name, False, f"Array validation error: {e}")
+
+def test_large_file(tmpdir):
     """Test handling of larger files."""
-    print("Test 6: Large file handling... ", end="")
+    name = "Large file handling"
     
-    with tempfile.TemporaryDirectory() as tmpdir:
-        gds_file = os.path.join(tmpdir, "large.gds")
-        info_out = os.path.join(tmpdir, "info.txt")
-        
-        # Create a file with many elements
-        lib = gdstk.Library("LARGE_TEST", unit=1e-6, precision=1e-9)
-        cell = lib.new_cell("LARGE")
-        
-        # Add 1000 rectangles
-        for i in range(100):
-            for j in range(10):
-                x = i * 20
-                y = j * 20
-                rect = gdstk.rectangle((x, y), (x+10, y+10), layer=(i % 10))
-                cell.add(rect)
-        
-        lib.write_gds(gds_file)
-        
-        # Test LayKit info command
-        returncode, stdout, stderr = run_laykit(["info", gds_file])
-        if returncode != 0:
-            print(f"FAIL\n  Info command error: {stderr}")
-            return False
-        
-        # Verify output contains expected info
-        if "1000" not in stdout and "LARGE" not in stdout:
-            print(f"FAIL\n  Unexpected info output")
-            return False
-        
-        print("PASS")
-        return True
+    gds_file = os.path.join(tmpdir, "large.gds")
+    info_out = os.path.join(tmpdir, "info.txt")
+    
+    # Create a file with many elements
+    lib = gdstk.Library("LARGE_TEST", unit=1e-6, precision=1e-9)
+    cell = lib.new_cell("LARGE")
+    
+    # Add 1000 rectangles: a 100x10 grid at 20-unit pitch, layer = column % 10.
+    # Each layer's columns form a regular 10x10 array at 200x20 pitch, so one
+    # repeated rectangle per layer describes them; write_gds expands every
+    # repetition into its own boundary, giving the same 1000 elements.
+    cell.add(*[
+        gdstk.rectangle((layer * 20, 0), (layer * 20 + 10, 10), layer=layer)
+        for layer in range(10)
+    ])
+    for rect in cell.polygons:
+        rect.repetition = gdstk.Repetition(columns=10, rows=10, spacing=(200, 20))
+    
+    lib.write_gds(gds_file)
+    
+    # Test LayKit info command
+    returncode, stdout, stderr = run_laykit(["info", gds_file])
+    if returncode != 0:
+        return Result(name, False, f"Info command error: {stderr.decode('utf-8', 'replace')}")
+    
+    # Verify output contains expected info
+    if len(_missing_needles(stdout, (b"1000", b"LARGE"))) == 2:
+        return Result(name, False, f"Unexpected info output")
+    
+    return Result(name, True, "")
 
-def test_paths_with_extensions():
+def test_paths_with_extensions(tmpdir):
     """Test path elements with begin/end extensions."""
-    print("Test 7: Path elements with extensions... ", end="")
+    name = "Path elements with extensions"
     
-    with tempfile.TemporaryDirectory() as tmpdir:
-        gds_file = os.path.join(tmpdir, "paths.gds")
-        gds_out = os.path.join(tmpdir, "paths_out.gds")
-        
-        # Create file with paths
-        lib = gdstk.Library("PATH_TEST", unit=1e-6, precision=1e-9)
-        cell = lib.new_cell("PATHS")
-        
-        # Add path with various properties
-        path1 = gdstk.FlexPath([(0, 0), (100, 0), (100, 100)], 10, layer=1)
-        cell.add(path1)
-        
-        # Add path with different width
-        path2 = gdstk.FlexPath([(200, 0), (300, 0), (300, 100)], 20, layer=2)
-        cell.add(path2)
+    gds_file = os.path.join(tmpdir, "paths.gds")
+    gds_out = os.path.join(tmpdir, "paths_out.gds")
+    
+    # Create file with paths
+    lib = gdstk.Library("PATH_TEST", unit=1e-6, precision=1e-9)
+    cell = lib.new_cell("PATHS")
+    
+    # Add two paths of different widths
+    cell.add(
+        gdstk.FlexPath([(0, 0), (100, 0), (100, 100)], 10, layer=1),
+        gdstk.FlexPath([(200, 0), (300, 0), (300, 100)], 20, layer=2),
+    )
+    
+    lib.write_gds(gds_file)
+    
+    # Round-trip through LayKit
+    returncode, _, stderr = run_laykit(["convert", gds_file, gds_out])
+    if returncode != 0:
+        return Result(name, False, f"Conversion error: {stderr.decode('utf-8', 'replace')}")
+    
+    # Verify with gdstk
+    try:
+        lib_back = gdstk.read_gds(gds_out)
+        cell_back = lib_back.cells[0]
         
-        lib.write_gds(gds_file)
+        # Paths are converted to polygons in GDSII/OASIS
+        if len(cell_back.polygons) < 2:
+            return Result(name, False, f"Expected at least 2 polygons (from paths), got {len(cell_back.polygons)}")
         
-        # Round-trip through LayKit
-        returncode, _, stderr = run_laykit(["convert", gds_file, gds_out])
-        if returncode != 0:
-            print(f"FAIL\n  Conversion error: {stderr}")
-            return False
+        return Result(name, True, "")
         
-        # Verify with gdstk
-        try:
-            lib_back = gdstk.read_gds(gds_out)
-            cell_back = lib_back.cells[0]
-            
-            # Paths are converted to polygons in GDSII/OASIS
-            if len(cell_back.polygons) < 2:
-                print(f"FAIL\n  Expected at least 2 polygons (from paths), got {len(cell_back.polygons)}")
-                return False
-            
-            print("PASS")
-            return True
-            
-        except Exception as e:
-            print(f"FAIL\n  Validation error: {e}")
-            return False
-
-def test_text_transformations():
+    except Exception as e:
+        return Result(name, False, f"Validation error: {e}")
+
+def test_text_transformations(tmpdir):
     """Test text elements with various transformations."""
-    print("Test 8: Text with transformations... ", end="")
+    name = "Text with transformations"
     
-    with tempfile.TemporaryDirectory() as tmpdir:
-        gds_file = os.path.join(tmpdir, "text.gds")
-        gds_out = os.path.join(tmpdir, "text_out.gds")
-        
-        # Create file with text elements
-        lib = gdstk.Library("TEXT_TEST", unit=1e-6, precision=1e-9)
-        cell = lib.new_cell("TEXT")
-        
-        # Normal text
-        text1 = gdstk.Label("NORMAL", (0, 0), layer=10)
-        cell.add(text1)
-        
-        # Rotated text
-        text2 = gdstk.Label("ROTATED", (100, 0), layer=10)
-        text2.rotation = 45  # 45 degrees
-        cell.add(text2)
-        
-        # Magnified text  
-        text3 = gdstk.Label("BIG", (200, 0), layer=10)
-        text3.magnification = 2.0
-        cell.add(text3)
-        
-        lib.write_gds(gds_file)
+    gds_file = os.path.join(tmpdir, "text.gds")
+    gds_out = os.path.join(tmpdir, "text_out.gds")
+    
+    # Create file with text elements
+    lib = gdstk.Library("TEXT_TEST", unit=1e-6, precision=1e-9)
+    cell = lib.new_cell("TEXT")
+    
+    # Normal, rotated (45 degrees) and magnified text
+    cell.add(
+        gdstk.Label("NORMAL", (0, 0), layer=10),
+        gdstk.Label("ROTATED", (100, 0), rotation=45, layer=10),
+        gdstk.Label("BIG", (200, 0), magnification=2.0, layer=10),
+    )
+    
+    lib.write_gds(gds_file)
+    
+    # Round-trip
+    returncode, _, stderr = run_laykit(["convert", gds_file, gds_out])
+    if returncode != 0:
+        return Result(name, False, f"Conversion error: {stderr.decode('utf-8', 'replace')}")
+    
+    try:
+        detail = Expect.of(lib).mismatch(gdstk.read_gds(gds_out))
+        if detail:
+            return Result(name, False, detail)
         
-        # Round-trip
-        returncode, _, stderr = run_laykit(["convert", gds_file, gds_out])
-        if returncode != 0:
-            print(f"FAIL\n  Conversion error: {stderr}")
-            return False
+        return Result(name, True, "")
         
-        try:
-            lib_back = gdstk.read_gds(gds_out)
-            cell_back = lib_back.cells[0]
-            
-            if len(cell_back.labels) < 3:
-                print(f"FAIL\n  Expected 3 labels, got {len(cell_back.labels)}")
-                return False
-            
-            print("PASS")
-            return True
-            
-        except Exception as e:
-            print(f"FAIL\n  Validation error: {e}")
-            return False
-
-def test_multiple_layers():
+    except Exception as e:
+        return Result(name, False, f"Validation error: {e}")
+
+def test_multiple_layers(tmpdir):
     """Test handling of multiple layers and datatypes."""
-    print("Test 9: Multiple layers and datatypes... ", end="")
+    name = "Multiple layers and datatypes"
     
-    with tempfile.TemporaryDirectory() as tmpdir:
-        gds_file = os.path.join(tmpdir, "layers.gds")
-        gds_out = os.path.join(tmpdir, "layers_out.gds")
-        
-        # Create file with elements on different layers
-        lib = gdstk.Library("LAYER_TEST", unit=1e-6, precision=1e-9)
-        cell = lib.new_cell("LAYERS")
-        
-        # Add elements on layers 0-9 with datatypes 0-2
-        for layer in range(10):
-            for datatype in range(3):
-                x = layer * 50
-                y = datatype * 50
-                rect = gdstk.rectangle((x, y), (x+40, y+40), layer=layer, datatype=datatype)
-                cell.add(rect)
-        
-        lib.write_gds(gds_file)
+    gds_file = os.path.join(tmpdir, "layers.gds")
+    gds_out = os.path.join(tmpdir, "layers_out.gds")
+    
+    # Create file with elements on different layers
+    lib = gdstk.Library("LAYER_TEST", unit=1e-6, precision=1e-9)
+    cell = lib.new_cell("LAYERS")
+    
+    # One 40x40 square per (layer 0-9, datatype 0-2) at a 50-unit pitch:
+    # all 30 outlines come from one (30, 4, 2) corner array.
+    layers, datatypes = (g.ravel() for g in np.mgrid[0:10, 0:3])
+    square = np.array([(0, 0), (40, 0), (40, 40), (0, 40)])
+    corners = square + 50 * np.stack([layers, datatypes], -1)[:, None, :]
+    cell.add(*[
+        gdstk.Polygon(points, layer=int(layer), datatype=int(datatype))
+        for points, layer, datatype in zip(corners, layers, datatypes)
+    ])
+    
+    lib.write_gds(gds_file)
+    
+    # Round-trip
+    returncode, _, stderr = run_laykit(["convert", gds_file, gds_out])
+    if returncode != 0:
+        return Result(name, False, f"Conversion error: {stderr.decode('utf-8', 'replace')}")
+    
+    try:
+        # All 10*3 (layer, datatype) pairs must come back, one polygon each
+        detail = Expect.of(lib).mismatch(gdstk.read_gds(gds_out))
+        if detail:
+            return Result(name, False, detail)
         
-        # Round-trip
-        returncode, _, stderr = run_laykit(["convert", gds_file, gds_out])
-        if returncode != 0:
-            print(f"FAIL\n  Conversion error: {stderr}")
-            return False
+        return Result(name, True, "")
         
-        try:
-            lib_back = gdstk.read_gds(gds_out)
-            cell_back = lib_back.cells[0]
-            
-            # Should have 10*3=30 polygons
-            if len(cell_back.polygons) != 30:
-                print(f"FAIL\n  Expected 30 polygons, got {len(cell_back.polygons)}")
-                return False
-            
-            # Check layer diversity
-            layers_found = set(p.layer for p in cell_back.polygons)
-            if len(layers_found) < 10:
-                print(f"FAIL\n  Expected 10 different layers, got {len(layers_found)}")
-                return False
-            
-            print("PASS")
-            return True
-            
-        except Exception as e:
-            print(f"FAIL\n  Validation error: {e}")
-            return False
-
-def test_deep_hierarchy():
+    except Exception as e:
+        return Result(name, False, f"Validation error: {e}")
+
+def test_deep_hierarchy(tmpdir):
     """Test deep hierarchical structures (3+ levels)."""
-    print("Test 10: Deep hierarchy (3+ levels)... ", end="")
+    name = "Deep hierarchy (3+ levels)"
     
-    with tempfile.TemporaryDirectory() as tmpdir:
-        gds_file = os.path.join(tmpdir, "hierarchy.gds")
-        gds_out = os.path.join(tmpdir, "hierarchy_out.gds")
-        
-        # Create deep hierarchy: TOP → MID → BOT → LEAF
-        lib = gdstk.Library("HIER_TEST", unit=1e-6, precision=1e-9)
-        
-        # Leaf cell (deepest level)
-        leaf = lib.new_cell("LEAF")
-        leaf_rect = gdstk.rectangle((0, 0), (10, 10), layer=1)
-        leaf.add(leaf_rect)
-        
-        # Bottom cell (level 3)
-        bot = lib.new_cell("BOT")
-        bot.add(gdstk.Reference(leaf, (0, 0)))
-        bot.add(gdstk.Reference(leaf, (20, 0)))
-        
-        # Middle cell (level 2)
-        mid = lib.new_cell("MID")
-        mid.add(gdstk.Reference(bot, (0, 0)))
-        mid.add(gdstk.Reference(bot, (0, 50)))
-        
-        # Top cell (level 1)
-        top = lib.new_cell("TOP")
-        top.add(gdstk.Reference(mid, (0, 0)))
-        top.add(gdstk.Reference(mid, (100, 0)))
+    gds_file = os.path.join(tmpdir, "hierarchy.gds")
+    gds_out = os.path.join(tmpdir, "hierarchy_out.gds")
+    
+    # Create deep hierarchy: TOP → MID → BOT → LEAF
+    lib = gdstk.Library("HIER_TEST", unit=1e-6, precision=1e-9)
+    
+    # Leaf cell (deepest level)
+    leaf = lib.new_cell("LEAF")
+    leaf_rect = gdstk.rectangle((0, 0), (10, 10), layer=1)
+    leaf.add(leaf_rect)
+    
+    # Bottom cell (level 3)
+    bot = lib.new_cell("BOT")
+    add_refs(bot, leaf, [dict(origin=(0, 0)), dict(origin=(20, 0))])
+    
+    # Middle cell (level 2)
+    mid = lib.new_cell("MID")
+    add_refs(mid, bot, [dict(origin=(0, 0)), dict(origin=(0, 50))])
+    
+    # Top cell (level 1)
+    top = lib.new_cell("TOP")
+    add_refs(top, mid, [dict(origin=(0, 0)), dict(origin=(100, 0))])
+    
+    lib.write_gds(gds_file)
+    
+    # Round-trip
+    returncode, _, stderr = run_laykit(["convert", gds_file, gds_out])
+    if returncode != 0:
+        return Result(name, False, f"Conversion error: {stderr.decode('utf-8', 'replace')}")
+    
+    try:
+        lib_back = gdstk.read_gds(gds_out)
         
-        lib.write_gds(gds_file)
+        # Check all cells exist
+        cells = cells_by_name(lib_back)
+        expected = {"TOP", "MID", "BOT", "LEAF"}
+        if not expected <= cells.keys():
+            return Result(name, False, f"Missing cells. Expected {expected}, got {set(cells)}")
         
-        # Round-trip
-        returncode, _, stderr = run_laykit(["convert", gds_file, gds_out])
-        if returncode != 0:
-            print(f"FAIL\n  Conversion error: {stderr}")
-            return False
+        return Result(name, True, "")
         
-        try:
-            lib_back = gdstk.read_gds(gds_out)
-            
-            # Check all cells exist
-            cell_names = {c.name for c in lib_back.cells}
-            expected = {"TOP", "MID", "BOT", "LEAF"}
-            if not expected.issubset(cell_names):
-                print(f"FAIL\n  Missing cells. Expected {expected}, got {cell_names}")
-                return False
-            
-            print("PASS")
-            return True
-            
-        except Exception as e:
-            print(f"FAIL\n  Validation error: {e}")
-            return False
-
-def test_transformations():
+    except Exception as e:
+        return Result(name, False, f"Validation error: {e}")
+
+def test_transformations(tmpdir):
     """Test reference transformations (rotation, mirror, magnification)."""
-    print("Test 11: Reference transformations... ", end="")
+    name = "Reference transformations"
     
-    with tempfile.TemporaryDirectory() as tmpdir:
-        gds_file = os.path.join(tmpdir, "transform.gds")
-        gds_out = os.path.join(tmpdir, "transform_out.gds")
-        
-        # Create file with transformed references
-        lib = gdstk.Library("XFORM_TEST", unit=1e-6, precision=1e-9)
-        
-        # Base cell
-        base = lib.new_cell("BASE")
-        base_rect = gdstk.rectangle((0, 0), (100, 50), layer=1)
-        base.add(base_rect)
-        
-        # Main cell with various transformations
-        main = lib.new_cell("MAIN")
-        
-        # Normal reference
-        ref1 = gdstk.Reference(base, (0, 0))
-        main.add(ref1)
-        
-        # Rotated reference
-        ref2 = gdstk.Reference(base, (200, 0), rotation=90)
-        main.add(ref2)
-        
-        # Mirrored reference
-        ref3 = gdstk.Reference(base, (400, 0), x_reflection=True)
-        main.add(ref3)
+    gds_file = os.path.join(tmpdir, "transform.gds")
+    gds_out = os.path.join(tmpdir, "transform_out.gds")
+    
+    # Create file with transformed references
+    lib = gdstk.Library("XFORM_TEST", unit=1e-6, precision=1e-9)
+    
+    # Base cell
+    base = lib.new_cell("BASE")
+    base_rect = gdstk.rectangle((0, 0), (100, 50), layer=1)
+    base.add(base_rect)
+    
+    # Main cell with normal, rotated, mirrored and magnified references
+    main = lib.new_cell("MAIN")
+    add_refs(main, base, [
+        dict(origin=(0, 0)),
+        dict(origin=(200, 0), rotation=90),
+        dict(origin=(400, 0), x_reflection=True),
+        dict(origin=(600, 0), magnification=2.0),
+    ])
+    
+    lib.write_gds(gds_file)
+    
+    # Round-trip
+    returncode, _, stderr = run_laykit(["convert", gds_file, gds_out])
+    if returncode != 0:
+        return Result(name, False, f"Conversion error: {stderr.decode('utf-8', 'replace')}")
+    
+    try:
+        lib_back = gdstk.read_gds(gds_out)
+        main_back = cells_by_name(lib_back).get("MAIN")
         
-        # Magnified reference
-        ref4 = gdstk.Reference(base, (600, 0), magnification=2.0)
-        main.add(ref4)
+        if not main_back:
+            return Result(name, False, f"MAIN cell not found")
         
-        lib.write_gds(gds_file)
+        # Should have references or flattened polygons
+        has_content = len(main_back.references) > 0 or len(main_back.polygons) > 0
+        if not has_content:
+            return Result(name, False, f"No content in MAIN cell")
         
-        # Round-trip
-        returncode, _, stderr = run_laykit(["convert", gds_file, gds_out])
-        if returncode != 0:
-            print(f"FAIL\n  Conversion error: {stderr}")
-            return False
+        return Result(name, True, "")
         
-        try:
-            lib_back = gdstk.read_gds(gds_out)
-            main_back = next((c for c in lib_back.cells if c.name == "MAIN"), None)
-            
-            if not main_back:
-                print(f"FAIL\n  MAIN cell not found")
-                return False
-            
-            # Should have references or flattened polygons
-            has_content = len(main_back.references) > 0 or len(main_back.polygons) > 0
-            if not has_content:
-                print(f"FAIL\n  No content in MAIN cell")
-                return False
-            
-            print("PASS")
-            return True
-            
-        except Exception as e:
-            print(f"FAIL\n  Validation error: {e}")
-            return False
-
-def test_extreme_coordinates():
+    except Exception as e:
+        return Result(name, False, f"Validation error: {e}")
+
+def test_extreme_coordinates(tmpdir):
     """Test handling of negative and large coordinates."""
-    print("Test 12: Extreme coordinates... ", end="")
+    name = "Extreme coordinates"
     
-    with tempfile.TemporaryDirectory() as tmpdir:
-        gds_file = os.path.join(tmpdir, "coords.gds")
-        gds_out = os.path.join(tmpdir, "coords_out.gds")
-        
-        # Create file with extreme coordinates
-        lib = gdstk.Library("COORD_TEST", unit=1e-6, precision=1e-9)
-        cell = lib.new_cell("COORDS")
-        
-        # Negative coordinates
-        rect1 = gdstk.rectangle((-1000, -1000), (-900, -900), layer=1)
-        cell.add(rect1)
-        
-        # Large positive coordinates
-        rect2 = gdstk.rectangle((1000000, 1000000), (1000100, 1000100), layer=1)
-        cell.add(rect2)
-        
-        # Mixed
-        rect3 = gdstk.rectangle((-500, 500), (500, 1000), layer=1)
-        cell.add(rect3)
-        
-        lib.write_gds(gds_file)
+    gds_file = os.path.join(tmpdir, "coords.gds")
+    gds_out = os.path.join(tmpdir, "coords_out.gds")
+    
+    # Create file with extreme coordinates
+    lib = gdstk.Library("COORD_TEST", unit=1e-6, precision=1e-9)
+    cell = lib.new_cell("COORDS")
+    
+    # Negative, large positive and mixed coordinates
+    cell.add(
+        gdstk.rectangle((-1000, -1000), (-900, -900), layer=1),
+        gdstk.rectangle((1000000, 1000000), (1000100, 1000100), layer=1),
+        gdstk.rectangle((-500, 500), (500, 1000), layer=1),
+    )
+    
+    lib.write_gds(gds_file)
+    
+    # Round-trip
+    returncode, _, stderr = run_laykit(["convert", gds_file, gds_out])
+    if returncode != 0:
+        return Result(name, False, f"Conversion error: {stderr.decode('utf-8', 'replace')}")
+    
+    try:
+        detail = Expect.of(lib).mismatch(gdstk.read_gds(gds_out))
+        if detail:
+            return Result(name, False, detail)
         
-        # Round-trip
-        returncode, _, stderr = run_laykit(["convert", gds_file, gds_out])
-        if returncode != 0:
-            print(f"FAIL\n  Conversion error: {stderr}")
-            return False
+        return Result(name, True, "")
         
-        try:
-            lib_back = gdstk.read_gds(gds_out)
-            cell_back = lib_back.cells[0]
-            
-            if len(cell_back.polygons) != 3:
-                print(f"FAIL\n  Expected 3 polygons, got {len(cell_back.polygons)}")
-                return False
-            
-            print("PASS")
-            return True
-            
-        except Exception as e:
-            print(f"FAIL\n  Validation error: {e}")
-            return False
-
-def test_roundtrip_stability():
+    except Exception as e:
+        return Result(name, False, f"Validation error: {e}")
+
+def test_roundtrip_stability(tmpdir):
     """Test multiple round-trip conversions for stability."""
-    print("Test 13: Round-trip stability (GDS→OAS→GDS→OAS)... ", end="")
-    
-    with tempfile.TemporaryDirectory() as tmpdir:
-        gds1 = os.path.join(tmpdir, "test1.gds")
-        oas1 = os.path.join(tmpdir, "test1.oas")
-        gds2 = os.path.join(tmpdir, "test2.gds")
-        oas2 = os.path.join(tmpdir, "test2.oas")
-        
-        # Create initial file
-        lib = gdstk.Library("STABLE_TEST", unit=1e-6, precision=1e-9)
-        cell = lib.new_cell("STABLE")
-        
-        rect = gdstk.rectangle((0, 0), (100, 100), layer=1)
-        poly = gdstk.Polygon([(200, 0), (300, 0), (250, 100)], layer=2)
-        text = gdstk.Label("TEST", (50, 50), layer=10)
-        
-        cell.add(rect)
-        cell.add(poly)
-        cell.add(text)
-        
-        lib.write_gds(gds1)
-        
-        # GDS → OAS → GDS → OAS
-        commands = [
-            (["convert", gds1, oas1], "GDS→OAS (1)"),
-            (["convert", oas1, gds2], "OAS→GDS"),
-            (["convert", gds2, oas2], "GDS→OAS (2)"),
-        ]
-        
-        for cmd, desc in commands:
-            returncode, _, stderr = run_laykit(cmd)
-            if returncode != 0:
-                print(f"FAIL\n  {desc} error: {stderr}")
-                return False
-        
-        # Verify final OAS can be read
-        returncode, stdout, stderr = run_laykit(["info", oas2])
+    name = "Round-trip stability (GDS→OAS→GDS→OAS)"
+    
+    gds1 = os.path.join(tmpdir, "test1.gds")
+    oas1 = os.path.join(tmpdir, "test1.oas")
+    gds2 = os.path.join(tmpdir, "test2.gds")
+    oas2 = os.path.join(tmpdir, "test2.oas")
+    
+    # Create initial file
+    lib, cell = new_fixture_library("STABLE_TEST", "STABLE")
+    
+    poly = gdstk.Polygon([(200, 0), (300, 0), (250, 100)], layer=2)
+    text = gdstk.Label("TEST", (50, 50), layer=10)
+    
+    cell.add(poly)
+    cell.add(text)
+    
+    lib.write_gds(gds1)
+    
+    # GDS → OAS → GDS → OAS
+    commands = [
+        (["convert", gds1, oas1], "GDS→OAS (1)"),
+        (["convert", oas1, gds2], "OAS→GDS"),
+        (["convert", gds2, oas2], "GDS→OAS (2)"),
+    ]
+    
+    for cmd, desc in commands:
+        returncode, _, stderr = run_laykit(cmd)
         if returncode != 0:
-            print(f"FAIL\n  Final info error: {stderr}")
-            return False
-        
-        if "STABLE" not in stdout:
-            print(f"FAIL\n  Cell lost after conversions")
-            return False
-        
-        print("PASS")
-        return True
+            return Result(name, False, f"{desc} error: {stderr.decode('utf-8', 'replace')}")
+    
+    # Stability without parsing the intermediates: both OASIS files come from
+    # the same logical content, so a deterministic writer makes them
+    # byte-identical, and the GDS sizes may differ only by writer details.
+    oas_digests = [_file_digest(path) for path in (oas1, oas2)]
+    if oas_digests[0] != oas_digests[1]:
+        return Result(name, False, f"OASIS output changed between round trips: {oas_digests}")
+    
+    gds_sizes = [os.path.getsize(path) for path in (gds1, gds2)]
+    if abs(gds_sizes[1] - gds_sizes[0]) > 0.05 * gds_sizes[0]:
+        return Result(name, False, f"GDS size drifted by more than 5%: {gds_sizes}")
+    
+    # Verify final OAS can be read
+    returncode, stdout, stderr = run_laykit(["info", oas2])
+    if returncode != 0:
+        return Result(name, False, f"Final info error: {stderr.decode('utf-8', 'replace')}")
+    
+    if b"STABLE" not in stdout:
+        return Result(name, False, f"Cell lost after conversions")
+    
+    return Result(name, True, "")
 
-def test_complex_polygons():
+def test_complex_polygons(tmpdir):
     """Test complex polygons with many vertices."""
-    print("Test 14: Complex polygons... ", end="")
-    
-    with tempfile.TemporaryDirectory() as tmpdir:
-        gds_file = os.path.join(tmpdir, "polygon.gds")
-        gds_out = os.path.join(tmpdir, "polygon_out.gds")
-        
-        # Create file with complex polygon
-        lib = gdstk.Library("POLY_TEST", unit=1e-6, precision=1e-9)
-        cell = lib.new_cell("POLYGON")
-        
-        # Create a complex polygon (octagon)
-        import math
-        points = []
-        for i in range(8):
-            angle = 2 * math.pi * i / 8
-            x = 500 + 400 * math.cos(angle)
-            y = 500 + 400 * math.sin(angle)
-            points.append((x, y))
-        
-        poly = gdstk.Polygon(points, layer=1)
-        cell.add(poly)
-        
-        # Also add a polygon with many points (circle approximation)
-        points2 = []
-        for i in range(100):
-            angle = 2 * math.pi * i / 100
-            x = 2000 + 200 * math.cos(angle)
-            y = 500 + 200 * math.sin(angle)
-            points2.append((x, y))
-        
-        poly2 = gdstk.Polygon(points2, layer=2)
-        cell.add(poly2)
-        
-        lib.write_gds(gds_file)
-        
-        # Round-trip
-        returncode, _, stderr = run_laykit(["convert", gds_file, gds_out])
-        if returncode != 0:
-            print(f"FAIL\n  Conversion error: {stderr}")
-            return False
+    name = "Complex polygons"
+    
+    gds_file = os.path.join(tmpdir, "polygon.gds")
+    gds_out = os.path.join(tmpdir, "polygon_out.gds")
+    
+    # Create file with complex polygon
+    lib = gdstk.Library("POLY_TEST", unit=1e-6, precision=1e-9)
+    cell = lib.new_cell("POLYGON")
+    
+    # A complex polygon (octagon) and one with many points (circle
+    # approximation), each vertex ring generated as a single array
+    def ring(cx, cy, r, n):
+        angles = np.linspace(0, 2 * np.pi, n, endpoint=False)
+        return np.column_stack([cx + r * np.cos(angles), cy + r * np.sin(angles)])
+    
+    cell.add(
+        gdstk.Polygon(ring(500, 500, 400, 8), layer=1),
+        gdstk.Polygon(ring(2000, 500, 200, 100), layer=2),
+    )
+    
+    lib.write_gds(gds_file)
+    
+    # Round-trip
+    returncode, _, stderr = run_laykit(["convert", gds_file, gds_out])
+    if returncode != 0:
+        return Result(name, False, f"Conversion error: {stderr.decode('utf-8', 'replace')}")
+    
+    try:
+        lib_back = gdstk.read_gds(gds_out)
+        cell_back = lib_back.cells[0]
         
-        try:
-            lib_back = gdstk.read_gds(gds_out)
-            cell_back = lib_back.cells[0]
-            
-            if len(cell_back.polygons) != 2:
-                print(f"FAIL\n  Expected 2 polygons, got {len(cell_back.polygons)}")
-                return False
-            
-            # Check vertex counts are preserved (or close for circle)
-            for poly in cell_back.polygons:
-                if len(poly.points) < 8:
-                    print(f"FAIL\n  Polygon has too few vertices: {len(poly.points)}")
-                    return False
-            
-            print("PASS")
-            return True
-            
-        except Exception as e:
-            print(f"FAIL\n  Validation error: {e}")
-            return False
-
-def main():
-    """Run all validation tests."""
-    print("=" * 60)
-    print("LayKit ↔ gdstk Cross-Validation Tests")
-    print("=" * 60)
-    print()
+        detail = Expect.of(lib).mismatch(lib_back)
+        if detail:
+            return Result(name, False, detail)
+        
+        # Check vertex counts are preserved (or close for circle)
+        for poly in cell_back.polygons:
+            if len(poly.points) < 8:
+                return Result(name, False, f"Polygon has too few vertices: {len(poly.points)}")
+        
+        return Result(name, True, "")
+        
+    except Exception as e:
+        return Result(name, False, f"Validation error: {e}")
+
+def _cache_key():
+    """Identify a run by the laykit binary, this script and the gdstk version."""
+    digest = hashlib.sha256()
+    with open(__file__, "rb") as f:
+        digest.update(f.read())
+    binary = f"{_LAYKIT_STAT.st_mtime_ns}-{_LAYKIT_STAT.st_size}"
+    return f"{digest.hexdigest()}-{binary}-{gdstk.__version__}"
+
+def _load_cached_results(key):
+    """Return {test_function: description} of tests that passed for key."""
+    try:
+        with open(CACHE_FILE) as f:
+            return json.load(f).get(key, {})
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+def _save_cached_results(key, results):
+    """Record results for key, dropping entries for older builds."""
+    try:
+        os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+        tmp = f"{CACHE_FILE}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({key: results}, f)
+        os.replace(tmp, CACHE_FILE)
+    except OSError:
+        pass
+
+def _warm_binary():
+    """Ask the kernel to start paging the laykit binary in before the first spawn."""
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        with open(LAYKIT_BIN, "rb") as f:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+
+def _start_worker():
+    """Start each pool worker's laykit daemon before its first test.
+
+    Workers exit without running atexit hooks; the daemon still exits on its
+    own once the worker dies and its stdin closes.
+    """
+    get_daemon()
+
+def _run_one(func_name, name, root):
+    """Run one test by function name in a pool worker.
+
+    The test gets its own directory, named after it, under the shared root;
+    a crash is reported under name, the test's description.
+    """
+    try:
+        tmpdir = os.path.join(root, func_name)
+        os.mkdir(tmpdir)
+        return globals()[func_name](tmpdir)
+    except Exception as e:
+        return Result(name, False, f"EXCEPTION: {e}")
+
+def _result_of(future, name):
+    """Return a finished test future's Result, turning a crash into a failure."""
+    try:
+        return future.result()
+    except Exception as e:
+        return Result(name, False, f"EXCEPTION: {e}")
+
+def main(argv=None):
+    """Run all validation tests and report them as TAP version 13."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--force", action="store_true",
+                        help="re-run tests that already passed against this laykit/gdstk build")
+    parser.add_argument("--fail-fast", action="store_true",
+                        help="stop at the first failing test and skip the ones not yet started")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="number of tests to run in parallel (default: CPU count)")
+    args = parser.parse_args(argv)
     
     # Check LayKit binary exists
-    if not os.path.exists(LAYKIT_BIN):
-        print(f"ERROR: LayKit binary not found at {LAYKIT_BIN}")
-        print("Build it first with: cargo build --release")
+    if _LAYKIT_STAT is None:
+        sys.stdout.write(
+            f"Bail out! LayKit binary not found at {LAYKIT_BIN}\n"
+            "# Build it first with: cargo build --release\n"
+        )
         return 1
     
-    # Run tests
-    tests = [
-        test_read_gdstk_file,
-        test_write_for_gdstk,
-        test_gds_to_oasis_conversion,
-        test_properties,
-        test_array_references,
-        test_large_file,
-        test_paths_with_extensions,
-        test_text_transformations,
-        test_multiple_layers,
-        test_deep_hierarchy,
-        test_transformations,
-        test_extreme_coordinates,
-        test_roundtrip_stability,
-        test_complex_polygons,
-    ]
+    # Run tests, each with the description it reports under
+    tests = {
+        test_read_gdstk_file: "LayKit reading gdstk-created file",
+        test_write_for_gdstk: "gdstk reading LayKit-created file",
+        test_gds_to_oasis_conversion: "GDS→OASIS conversion validation",
+        test_properties: "Property preservation",
+        test_array_references: "Array reference (AREF) handling",
+        test_large_file: "Large file handling",
+        test_paths_with_extensions: "Path elements with extensions",
+        test_text_transformations: "Text with transformations",
+        test_multiple_layers: "Multiple layers and datatypes",
+        test_deep_hierarchy: "Deep hierarchy (3+ levels)",
+        test_transformations: "Reference transformations",
+        test_extreme_coordinates: "Extreme coordinates",
+        test_roundtrip_stability: "Round-trip stability (GDS→OAS→GDS→OAS)",
+        test_complex_polygons: "Complex polygons",
+    }
     
-    passed = 0
-    failed = 0
+    # Tests are deterministic in (laykit build, gdstk version, this script),
+    # so anything that already passed for this key is not re-run.
+    key = _cache_key()
+    cached = {} if args.force else _load_cached_results(key)
+    results = {
+        test.__name__: Result(cached[test.__name__], True, "SKIP passed on a previous run")
+        for test in tests if isinstance(cached.get(test.__name__), str)
+    }
+    pending = [test for test in tests if test.__name__ not in results]
     
-    for test in tests:
-        try:
-            if test():
-                passed += 1
-            else:
-                failed += 1
-        except Exception as e:
-            print(f"EXCEPTION: {e}")
-            failed += 1
-    
-    print()
-    print("=" * 60)
-    print(f"Results: {passed} passed, {failed} failed out of {len(tests)} tests")
-    print("=" * 60)
+    # Tests are independent (own subdirectories, own fixtures), so run them
+    # across cores and report them in the original order afterwards. One
+    # root directory is created and removed for the whole run.
+    workers = max(1, min(len(pending), args.jobs))
+    if pending and workers == 1:
+        # A pool of one only adds a worker process; run in this one instead
+        _warm_binary()
+        with tempfile.TemporaryDirectory(dir=SHM) as root:
+            for test in pending:
+                results[test.__name__] = _run_one(test.__name__, tests[test], root)
+                if args.fail_fast and not results[test.__name__].ok:
+                    break
+    elif pending:
+        _warm_binary()
+        with tempfile.TemporaryDirectory(dir=SHM) as root, \
+                ProcessPoolExecutor(max_workers=workers, initializer=_start_worker) as ex:
+            futures = {
+                ex.submit(_run_one, test.__name__, tests[test], root): test for test in pending
+            }
+            for future in as_completed(futures):
+                if args.fail_fast and not _result_of(future, tests[futures[future]]).ok:
+                    # Tests already running still finish and are reported
+                    ex.shutdown(cancel_futures=True)
+                    break
+        for future, test in futures.items():
+            if not future.cancelled():
+                results[test.__name__] = _result_of(future, tests[test])
+    
+    _save_cached_results(key, {func: r.name for func, r in results.items() if r.ok})
+    
+    # Render everything in one write: plan, one line per test, YAML
+    # diagnostics under failures, and a closing summary comment.
+    lines = ["TAP version 13", f"1..{len(tests)}"]
+    for number, test in enumerate(tests, 1):
+        r = results.get(test.__name__)
+        if r is None:
+            lines.append(f"ok {number} - {tests[test]} # SKIP not run (--fail-fast)")
+        elif r.ok:
+            directive = f" # {r.detail}" if r.detail else ""
+            lines.append(f"ok {number} - {r.name}{directive}")
+        else:
+            lines.append(f"not ok {number} - {r.name}")
+            lines.append("  ---")
+            lines.append("  message: |")
+            lines.extend(f"    {line}" for line in r.detail.splitlines())
+            lines.append("  ...")
+    passed = sum(r.ok for r in results.values())
+    failed = len(results) - passed
+    summary = f"# Results: {passed} passed, {failed} failed out of {len(tests)} tests"
+    if len(results) < len(tests):
+        summary += f" ({len(tests) - len(results)} not run)"
+    lines.append(summary)
+    sys.stdout.write("\n".join(lines) + "\n")
     
     return 0 if failed == 0 else 1
 
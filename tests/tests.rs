@@ -984,6 +984,216 @@ mod cli_tests {
         fs::remove_file(output_path).ok();
     }
 
+    #[test]
+    fn test_cli_convert_chained_outputs() {
+        let input_path = "tests/cli_test_chain.gds";
+        let oas_path = "tests/cli_test_chain.oas";
+        let back_path = "tests/cli_test_chain_back.gds";
+
+        let mut gds = GDSIIFile::new("CHAINTEST".to_string());
+        gds.units = (1e-6, 1e-9);
+        gds.structures.push(GDSStructure {
+            name: "CHAINCELL".to_string(),
+            creation_time: GDSTime::now(),
+            modification_time: GDSTime::now(),
+            strclass: None,
+            elements: vec![GDSElement::Boundary(Boundary {
+                layer: 1,
+                datatype: 0,
+                xy: vec![(0, 0), (100, 0), (100, 100), (0, 100), (0, 0)],
+                elflags: None,
+                plex: None,
+                properties: Vec::new(),
+            })],
+        });
+        gds.write_to_file(input_path).unwrap();
+
+        let output = Command::new(get_cli_path())
+            .arg("convert")
+            .arg(input_path)
+            .arg(oas_path)
+            .arg(back_path)
+            .output()
+            .expect("Failed to execute CLI");
+
+        assert!(output.status.success());
+        let stdout = String::from_utf8_lossy(&output.stdout);
+        assert!(stdout.contains(&format!("Converting {} -> {}", oas_path, back_path)));
+
+        let oasis = OASISFile::read_from_file(oas_path).unwrap();
+        assert_eq!(oasis.cells[0].name, "CHAINCELL");
+        let back = GDSIIFile::read_from_file(back_path).unwrap();
+        assert_eq!(back.library_name, "CHAINTEST");
+        assert_eq!(back.structures[0].name, "CHAINCELL");
+        assert_eq!(back.structures[0].elements.len(), 1);
+
+        // Cleanup
+        fs::remove_file(input_path).ok();
+        fs::remove_file(oas_path).ok();
+        fs::remove_file(back_path).ok();
+    }
+
+    #[test]
+    fn test_cli_convert_oasis_is_deterministic() {
+        let input_path = "tests/cli_test_deterministic.gds";
+
+        let mut gds = GDSIIFile::new("DETERMINISTIC".to_string());
+        gds.units = (1e-6, 1e-9);
+        gds.structures.push(GDSStructure {
+            name: "LABELS".to_string(),
+            creation_time: GDSTime::now(),
+            modification_time: GDSTime::now(),
+            strclass: None,
+            elements: (0..5)
+                .map(|i| {
+                    GDSElement::Text(GText {
+                        layer: 10,
+                        texttype: 0,
+                        string: format!("LABEL{}", i),
+                        xy: (i * 100, 0),
+                        presentation: None,
+                        strans: None,
+                        width: None,
+                        elflags: None,
+                        plex: None,
+                        properties: Vec::new(),
+                    })
+                })
+                .collect(),
+        });
+        gds.write_to_file(input_path).unwrap();
+
+        // Each run is a separate process with its own hash seed, so name
+        // tables written in hash order would differ between the two
+        let convert = || {
+            let output = Command::new(get_cli_path())
+                .arg("convert")
+                .arg(input_path)
+                .arg("-")
+                .arg("--format=oas")
+                .output()
+                .expect("Failed to execute CLI");
+            assert!(output.status.success());
+            output.stdout
+        };
+        assert_eq!(convert(), convert());
+
+        // Cleanup
+        fs::remove_file(input_path).ok();
+    }
+
+    #[test]
+    fn test_cli_convert_to_stdout() {
+        let input_path = "tests/cli_test_stdout.gds";
+
+        let mut gds = GDSIIFile::new("STDOUTTEST".to_string());
+        gds.units = (1e-6, 1e-9);
+        gds.structures.push(GDSStructure {
+            name: "STDOUTCELL".to_string(),
+            creation_time: GDSTime::now(),
+            modification_time: GDSTime::now(),
+            strclass: None,
+            elements: Vec::new(),
+        });
+        gds.write_to_file(input_path).unwrap();
+
+        let output = Command::new(get_cli_path())
+            .arg("convert")
+            .arg(input_path)
+            .arg("-")
+            .arg("--format=oas")
+            .output()
+            .expect("Failed to execute CLI");
+
+        assert!(output.status.success());
+        let stderr = String::from_utf8_lossy(&output.stderr);
+        assert!(stderr.contains("successful"));
+        let oasis = OASISFile::read_from_reader(&mut Cursor::new(output.stdout)).unwrap();
+        assert_eq!(oasis.cells[0].name, "STDOUTCELL");
+
+        // `-` has no extension, so the format must be given explicitly
+        let output = Command::new(get_cli_path())
+            .arg("convert")
+            .arg(input_path)
+            .arg("-")
+            .output()
+            .expect("Failed to execute CLI");
+
+        assert!(!output.status.success());
+        let stderr = String::from_utf8_lossy(&output.stderr);
+        assert!(stderr.contains("--format"));
+
+        // A file output takes its format from its extension, so --format is rejected
+        let output_path = "tests/cli_test_stdout.oas";
+        let output = Command::new(get_cli_path())
+            .arg("convert")
+            .arg(input_path)
+            .arg(output_path)
+            .arg("--format=gds")
+            .output()
+            .expect("Failed to execute CLI");
+
+        assert!(!output.status.success());
+        let stderr = String::from_utf8_lossy(&output.stderr);
+        assert!(stderr.contains("--format only applies"));
+        assert!(!std::path::Path::new(output_path).exists());
+
+        // Cleanup
+        fs::remove_file(input_path).ok();
+    }
+
+    #[test]
+    fn test_cli_convert_from_stdin() {
+        use std::io::Write;
+        use std::process::Stdio;
+
+        let output_path = "tests/cli_test_stdin.oas";
+
+        let mut gds = GDSIIFile::new("STDINTEST".to_string());
+        gds.units = (1e-6, 1e-9);
+        gds.structures.push(GDSStructure {
+            name: "STDINCELL".to_string(),
+            creation_time: GDSTime::now(),
+            modification_time: GDSTime::now(),
+            strclass: None,
+            elements: Vec::new(),
+        });
+        let mut gds_bytes = Vec::new();
+        gds.write_to_writer(&mut gds_bytes).unwrap();
+
+        let run = |args: &[&str], input: &[u8]| {
+            let mut child = Command::new(get_cli_path())
+                .args(args)
+                .stdin(Stdio::piped())
+                .stdout(Stdio::piped())
+                .stderr(Stdio::piped())
+                .spawn()
+                .expect("Failed to execute CLI");
+            child.stdin.take().unwrap().write_all(input).unwrap();
+            child.wait_with_output().unwrap()
+        };
+
+        // The format of `-` is detected from the piped bytes
+        let output = run(&["convert", "-", output_path], &gds_bytes);
+        assert!(output.status.success());
+        let oasis = OASISFile::read_from_file(output_path).unwrap();
+        assert_eq!(oasis.cells[0].name, "STDINCELL");
+
+        // stdin to stdout
+        let output = run(&["convert", "-", "-", "--format=gds"], &gds_bytes);
+        assert!(output.status.success());
+        let back = GDSIIFile::read_from_reader(&mut Cursor::new(output.stdout)).unwrap();
+        assert_eq!(back.structures[0].name, "STDINCELL");
+
+        let output = run(&["convert", "-", output_path], b"not a layout");
+        assert!(!output.status.success());
+        let stderr = String::from_utf8_lossy(&output.stderr);
+        assert!(stderr.contains("Cannot determine input file format"));
+
+        // Cleanup
+        fs::remove_file(output_path).ok();
+    }
+
     #[test]
     fn test_cli_info_gds() {
         // Create a test GDSII file
@@ -1183,6 +1393,104 @@ mod cli_tests {
         // Cleanup
         fs::remove_file(test_path).ok();
     }
+
+    #[test]
+    fn test_cli_batch_mode() {
+        use std::io::Write;
+        use std::process::Stdio;
+
+        let input_path = "tests/cli_test_batch.gds";
+        let output_path = "tests/cli_test_batch.oas";
+
+        let mut gds = GDSIIFile::new("BATCHTEST".to_string());
+        gds.units = (1e-6, 1e-9);
+        gds.structures.push(GDSStructure {
+            name: "BATCHCELL".to_string(),
+            creation_time: GDSTime::now(),
+            modification_time: GDSTime::now(),
+            strclass: None,
+            elements: vec![GDSElement::Boundary(Boundary {
+                layer: 1,
+                datatype: 0,
+                xy: vec![(0, 0), (100, 0), (100, 100), (0, 100), (0, 0)],
+                elflags: None,
+                plex: None,
+                properties: Vec::new(),
+            })],
+        });
+        gds.write_to_file(input_path).unwrap();
+
+        let mut child = Command::new(get_cli_path())
+            .arg("--batch")
+            .stdin(Stdio::piped())
+            .stdout(Stdio::piped())
+            .spawn()
+            .expect("Failed to execute CLI");
+
+        let requests = [
+            serde_json::json!(["info", input_path]),
+            serde_json::json!(["convert", input_path, output_path]),
+            serde_json::json!(["info", "nonexistent_file.gds"]),
+            serde_json::json!(["convert", "-", output_path]),
+        ];
+        {
+            let mut stdin = child.stdin.take().unwrap();
+            for request in &requests {
+                writeln!(stdin, "{}", request).unwrap();
+            }
+            writeln!(stdin, "not json").unwrap();
+        }
+
+        let output = child.wait_with_output().unwrap();
+        assert!(output.status.success());
+
+        let replies: Vec<serde_json::Value> = String::from_utf8_lossy(&output.stdout)
+            .lines()
+            .map(|line| serde_json::from_str(line).unwrap())
+            .collect();
+        assert_eq!(replies.len(), 5);
+
+        assert_eq!(replies[0]["returncode"], 0);
+        assert!(replies[0]["stdout"].as_str().unwrap().contains("BATCHTEST"));
+
+        assert_eq!(replies[1]["returncode"], 0);
+        assert!(
+            replies[1]["stdout"]
+                .as_str()
+                .unwrap()
+                .contains("successful")
+        );
+        assert!(std::path::Path::new(output_path).exists());
+
+        assert_eq!(replies[2]["returncode"], 1);
+        assert!(
+            replies[2]["stderr"]
+                .as_str()
+                .unwrap()
+                .contains("does not exist")
+        );
+
+        // stdin carries the commands, so it cannot carry an input layout
+        assert_eq!(replies[3]["returncode"], 1);
+        assert!(
+            replies[3]["stderr"]
+                .as_str()
+                .unwrap()
+                .contains("not supported in batch mode")
+        );
+
+        assert_eq!(replies[4]["returncode"], 1);
+        assert!(
+            replies[4]["stderr"]
+                .as_str()
+                .unwrap()
+                .contains("invalid batch command")
+        );
+
+        // Cleanup
+        fs::remove_file(input_path).ok();
+        fs::remove_file(output_path).ok();
+    }
 }
 
 // ============================================================================